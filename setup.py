@@ -7,12 +7,14 @@ setup(
     install_requires=[
         "aiohttp>=3.8.0",
         "irc>=20.0.0",
+        "orjson>=3.9.0",
         "asyncio>=3.4.3",
         "asyncio-irc>=0.2.2",
         "sqlalchemy>=1.4.0",
         "aiosqlite>=0.17.0",
-        "httpx>=0.24.0",
+        "httpx[http2]>=0.24.0",
         "python-dotenv>=0.19.0",
+        "rapidfuzz>=3.0.0",
     ],
-    python_requires=">=3.9",
+    python_requires=">=3.10",
 )
\ No newline at end of file
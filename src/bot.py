@@ -8,10 +8,20 @@ from game_manager import GameManager
 from services.mistral_service import MistralService
 from database import Database
 from config import BotConfig
+from utils.text_processing import extract_command
 
 logger = logging.getLogger(__name__)
 
 class QuizBot:
+    # Command name -> handler method name, resolved at dispatch time
+    _CMD_NAMES = {
+        '!quiz': 'cmd_quiz',
+        '!help': 'cmd_help',
+        '!stats': 'cmd_stats',
+        '!leaderboard': 'cmd_leaderboard',
+        '!stop': 'cmd_stop'
+    }
+    
     def __init__(self, config: BotConfig):
         self.config = config
         self.reactor = irc.client.Reactor()
@@ -19,13 +29,6 @@ class QuizBot:
         self.database = Database(config.database_url)
         self.question_service = MistralService(config.mistral_api_key, self.database)
         self.game_manager = GameManager(self)
-        self.command_handlers = {
-            '!quiz': self.cmd_quiz,
-            '!help': self.cmd_help,
-            '!stats': self.cmd_stats,
-            '!leaderboard': self.cmd_leaderboard,
-            '!stop': self.cmd_stop
-        }
         
     async def connect(self):
         """Connect to IRC server and join channels"""
@@ -71,9 +74,10 @@ class QuizBot:
         """Handler for public messages"""
         msg = event.arguments[0]
         if msg.startswith('!'):
-            command = msg.split()[0].lower()
-            if command in self.command_handlers:
-                await self.command_handlers[command](event)
+            command, _ = extract_command(msg)
+            name = self._CMD_NAMES.get(command)
+            if name:
+                await getattr(self, name)(event)
 
     def _on_disconnect(self, connection, event):
         """Handler for disconnection"""
@@ -1,17 +1,31 @@
 import asyncio
+import heapq
 import logging
-from datetime import datetime
 from typing import Dict, Optional, Set
 from dataclasses import dataclass, field
 
 logger = logging.getLogger(__name__)
 
+# Common answer variations, mapped to the canonical answer they stand for
+ANSWER_VARIATIONS = {
+    'saxophone': 'reed',
+    'sax': 'reed',
+    'pink floyd': 'pinkfloyd',
+    'fleet wood mac': 'fleetwoodmac',
+    'fleet wood': 'fleetwoodmac',
+    'bruce springsteen': 'springsteen'
+}
+
+# Every variation and canonical form mapped to its canonical answer
+_CANONICAL_ANSWERS = {main: main for main in ANSWER_VARIATIONS.values()}
+_CANONICAL_ANSWERS.update(ANSWER_VARIATIONS)
+
 @dataclass
 class PlayerState:
     score: int = 0
     streak: int = 0
     correct_answers: int = 0
-    last_answer_time: Optional[datetime] = None
+    last_answer_time: Optional[float] = None
     best_streak: int = 0
 
 @dataclass
@@ -20,7 +34,7 @@ class GameState:
     starter: str
     players: Dict[str, PlayerState] = field(default_factory=dict)
     current_question: Optional[dict] = None
-    question_start_time: Optional[datetime] = None
+    question_start_time: Optional[float] = None
     question_number: int = 0
     active: bool = True
     used_questions: Set[str] = field(default_factory=set)
@@ -92,7 +106,7 @@ class GameManager:
                 
             game.used_questions.add(question["id"])
             game.current_question = question
-            game.question_start_time = datetime.now()
+            game.question_start_time = asyncio.get_running_loop().time()
             
             # Display question
             await self.bot.send_message(
@@ -127,11 +141,11 @@ class GameManager:
             game.players[nick] = PlayerState()
 
         player = game.players[nick]
-        now = datetime.now()
+        now = asyncio.get_running_loop().time()
         
         # Anti-cheat: Check minimum answer time
         if (player.last_answer_time and 
-            (now - player.last_answer_time).total_seconds() < self.bot.config.min_answer_time):
+            now - player.last_answer_time < self.bot.config.min_answer_time):
             return
 
         player.last_answer_time = now
@@ -139,7 +153,7 @@ class GameManager:
         # Check answer
         if self.check_answer(answer, game.current_question['answer']):
             # Calculate points
-            time_taken = (now - game.question_start_time).total_seconds()
+            time_taken = now - game.question_start_time
             points = self.calculate_points(time_taken, player.streak)
             
             # Update player stats
@@ -179,26 +193,9 @@ class GameManager:
         if given.rstrip('s') == correct.rstrip('s'):
             return True
             
-        # Handle common variations
-        variations = {
-            'saxophone': 'reed',
-            'sax': 'reed',
-            'pink floyd': 'pinkfloyd',
-            'fleet wood mac': 'fleetwoodmac',
-            'fleet wood': 'fleetwoodmac',
-            'bruce springsteen': 'springsteen'
-        }
-        
-        # Check if given answer maps to correct answer
-        if variations.get(given) == correct:
-            return True
-            
-        # Check if correct answer has variations that match given answer
-        for var, ans in variations.items():
-            if given == ans and correct in [var, ans]:
-                return True
-                
-        return False
+        # Handle common variations with a single canonical-form lookup
+        canonical = _CANONICAL_ANSWERS.get(given)
+        return canonical is not None and canonical == _CANONICAL_ANSWERS.get(correct)
 
     def calculate_points(self, time_taken: float, streak: int) -> int:
         """Calculate points based on answer speed and streak"""
@@ -243,21 +240,21 @@ class GameManager:
         if not game:
             return
             
-        # Sort players by score
-        sorted_players = sorted(
+        # Only the top five are shown, no need to sort everyone
+        top_players = heapq.nlargest(
+            5,
             game.players.items(),
-            key=lambda x: x[1].score,
-            reverse=True
+            key=lambda x: x[1].score
         )
         
-        if not sorted_players:
+        if not top_players:
             await self.bot.send_message(channel, "Game ended with no scores!")
             return
             
         message = "🏁 Final Scores:\n" + "\n".join(
             f"{i+1}. {nick}: {player.score} points "
             f"({player.correct_answers} correct, best streak: {player.best_streak})"
-            for i, (nick, player) in enumerate(sorted_players[:5])
+            for i, (nick, player) in enumerate(top_players)
         )
         
         await self.bot.send_message(channel, message)
@@ -268,13 +265,15 @@ class GameManager:
         if not game:
             return
             
-        for nick, player in game.players.items():
-            await self.bot.database.update_player_stats(
-                nick=nick,
-                score=player.score,
-                correct_answers=player.correct_answers,
-                best_streak=player.best_streak
-            )
+        await self.bot.database.update_player_stats_bulk([
+            {
+                'nick': nick,
+                'score': player.score,
+                'correct_answers': player.correct_answers,
+                'best_streak': player.best_streak
+            }
+            for nick, player in game.players.items()
+        ])
 
     async def stop_all_games(self):
         """Stop all active games (used during shutdown)"""
@@ -60,7 +60,6 @@ async def main():
         # Main event loop
         while True:
             await irc_service.process()
-            await asyncio.sleep(0.1)
             
     except KeyboardInterrupt:
         logger.info("Shutting down bot...")
@@ -1,15 +1,20 @@
 import logging
+import random
 from typing import List, Dict, Optional
 import asyncio
 import aiosqlite
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker, declarative_base
-from sqlalchemy import Column, Integer, String, Float, Boolean, select, func, text
+from sqlalchemy import Column, Integer, String, Float, Boolean, Index, event, select, update, func, text
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
 logger = logging.getLogger(__name__)
 
 Base = declarative_base()
 
+# Number of unused questions to sample from when picking one at random
+UNUSED_CANDIDATE_WINDOW = 50
+
 class Question(Base):
     __tablename__ = 'questions'
     
@@ -22,6 +27,13 @@ class Question(Base):
     difficulty = Column(Integer, nullable=False)  # 1-3 for easy, medium, hard
     used = Column(Boolean, default=False)  # Track if question was used in a game
     last_used = Column(Float, nullable=True)  # Timestamp when question was last used
+    
+    __table_args__ = (
+        Index(
+            'ix_questions_used_last_used', 'used', 'last_used',
+            sqlite_where=text('used = 0')
+        ),
+    )
 
 class Player(Base):
     __tablename__ = 'players'
@@ -33,6 +45,25 @@ class Player(Base):
     best_streak = Column(Integer, default=0)
     fastest_answer = Column(Float, nullable=True)  # Store fastest answer time in seconds
 
+# Columns returned by the read-only stats queries; selecting them directly
+# skips building ORM Player objects
+_PLAYER_STAT_COLUMNS = (
+    Player.nick,
+    Player.total_score,
+    Player.correct_answers,
+    Player.best_streak,
+    Player.fastest_answer
+)
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Tune each new SQLite connection for concurrent reads during writes."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA mmap_size=268435456")
+    cursor.close()
+
 class Database:
     def __init__(self, database_url: str):
         self.database_url = database_url
@@ -46,6 +77,8 @@ class Database:
                 self.database_url,
                 echo=False
             )
+            if self.engine.dialect.name == 'sqlite':
+                event.listen(self.engine.sync_engine, 'connect', _set_sqlite_pragmas)
             
             self.SessionLocal = sessionmaker(
                 bind=self.engine,
@@ -55,6 +88,9 @@ class Database:
             
             async with self.engine.begin() as conn:
                 await conn.run_sync(Base.metadata.create_all)
+                # create_all skips indexes on tables that already exist
+                for index in Question.__table__.indexes:
+                    await conn.run_sync(index.create, checkfirst=True)
                 
             logger.info("Database connection established")
             
@@ -72,17 +108,12 @@ class Database:
         """Get stats for a specific player"""
         async with self.SessionLocal() as session:
             result = await session.execute(
-                select(Player).where(Player.nick == nick)
+                select(*_PLAYER_STAT_COLUMNS[1:]).where(Player.nick == nick)
             )
-            player = result.scalar_one_or_none()
-            
-            if player:
-                return {
-                    'total_score': player.total_score,
-                    'correct_answers': player.correct_answers,
-                    'best_streak': player.best_streak,
-                    'fastest_answer': player.fastest_answer
-                }
+            row = result.first()
+            
+            if row:
+                return row._asdict()
             return None
 
     async def update_player_stats(
@@ -94,133 +125,175 @@ class Database:
         answer_time: Optional[float] = None
     ):
         """Update or create player stats"""
-        async with self.SessionLocal() as session:
-            result = await session.execute(
-                select(Player).where(Player.nick == nick)
-            )
-            player = result.scalar_one_or_none()
-            
-            if player:
-                player.total_score += score
-                player.correct_answers += correct_answers
-                player.best_streak = max(player.best_streak, best_streak)
-                if answer_time is not None:
-                    if player.fastest_answer is None or answer_time < player.fastest_answer:
-                        player.fastest_answer = answer_time
-            else:
-                player = Player(
-                    nick=nick,
-                    total_score=score,
-                    correct_answers=correct_answers,
-                    best_streak=best_streak,
-                    fastest_answer=answer_time
+        await self.update_player_stats_bulk([{
+            'nick': nick,
+            'score': score,
+            'correct_answers': correct_answers,
+            'best_streak': best_streak,
+            'answer_time': answer_time
+        }])
+
+    async def update_player_stats_bulk(self, rows: List[Dict]):
+        """Update or create stats for several players in one statement.
+        
+        Each row takes the same keys as update_player_stats.
+        """
+        if not rows:
+            return
+            
+        stmt = sqlite_insert(Player).values([
+            {
+                'nick': row['nick'],
+                'total_score': row['score'],
+                'correct_answers': row['correct_answers'],
+                'best_streak': row['best_streak'],
+                'fastest_answer': row.get('answer_time')
+            }
+            for row in rows
+        ])
+        excluded = stmt.excluded
+        # Merge into the existing row in one statement instead of SELECT + UPDATE
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['nick'],
+            set_={
+                'total_score': Player.total_score + excluded.total_score,
+                'correct_answers': Player.correct_answers + excluded.correct_answers,
+                'best_streak': func.max(Player.best_streak, excluded.best_streak),
+                # min() returns NULL if either side is NULL, so coalesce both
+                'fastest_answer': func.min(
+                    func.coalesce(Player.fastest_answer, excluded.fastest_answer),
+                    func.coalesce(excluded.fastest_answer, Player.fastest_answer)
                 )
-                session.add(player)
-                
+            }
+        )
+        
+        async with self.SessionLocal() as session:
+            await session.execute(stmt)
             await session.commit()
 
     async def get_leaderboard(self, limit: int = 10) -> List[Dict]:
         """Get top players by total score"""
         async with self.SessionLocal() as session:
             result = await session.execute(
-                select(Player)
+                select(*_PLAYER_STAT_COLUMNS)
                 .order_by(Player.total_score.desc())
                 .limit(limit)
             )
-            players = result.scalars().all()
-            
-            return [
-                {
-                    'nick': player.nick,
-                    'total_score': player.total_score,
-                    'correct_answers': player.correct_answers,
-                    'best_streak': player.best_streak,
-                    'fastest_answer': player.fastest_answer
-                }
-                for player in players
-            ]
+            return [row._asdict() for row in result]
             
     async def add_questions(self, questions: List[Dict]) -> int:
         """Add multiple questions to the database. Returns number of questions added."""
         async with self.SessionLocal() as session:
-            added = 0
+            # Load existing answers and question texts once, rather than
+            # running a LIKE scan over the whole table for every question
+            existing = await session.execute(
+                select(Question.answer, Question.question_text)
+            )
+            known_answers = set()
+            known_texts = []
+            for answer, question_text in existing:
+                known_answers.add(answer)
+                known_texts.append(question_text)
+            # Newline-joined so a single C-level substring search covers all rows
+            known_text = '\n'.join(known_texts).lower()
+            
+            rows = []
             for q in questions:
-                # Check for duplicate or very similar questions
-                similar = await session.execute(
-                    select(Question).where(
-                        (Question.answer == q['answer']) |
-                        (Question.question_text.like(f"%{q['answer']}%"))
-                    )
-                )
-                # Use first() instead of scalar_one_or_none() to handle multiple results
-                if not similar.first():
-                    question = Question(
-                        question_id=q['id'],
-                        question_text=q['question'],
-                        answer=q['answer'],
-                        fun_fact=q['fun_fact'],
-                        category=q.get('category', 'general'),
-                        difficulty=q.get('difficulty', 2),  # Default to medium
-                        used=False
-                    )
-                    session.add(question)
-                    added += 1
+                answer = q['answer']
+                answer_lower = answer.lower()
+                
+                # Check for duplicate or very similar questions, including
+                # ones staged earlier in this batch
+                if answer in known_answers or answer_lower in known_text:
+                    continue
+                if any(answer_lower in row['question_text'].lower() for row in rows):
+                    continue
+                    
+                known_answers.add(answer)
+                rows.append({
+                    'question_id': q['id'],
+                    'question_text': q['question'],
+                    'answer': answer,
+                    'fun_fact': q['fun_fact'],
+                    'category': q.get('category', 'general'),
+                    'difficulty': q.get('difficulty', 2),  # Default to medium
+                    'used': False
+                })
+                    
+            if not rows:
+                return 0
+                
+            # Insert the whole batch in one statement instead of one per row
+            result = await session.execute(
+                sqlite_insert(Question).values(rows).on_conflict_do_nothing()
+            )
             await session.commit()
-            return added
+            return result.rowcount
+            
+    async def _pick_unused_question(
+        self,
+        session: AsyncSession,
+        category: Optional[str] = None
+    ) -> Optional[Question]:
+        """Pick a random unused question, optionally from a single category."""
+        query = select(Question.id).where(Question.used == False)
+        if category is not None:
+            query = query.where(Question.category == category)
+            
+        # Sample from a small window served by the (used, last_used) index
+        # instead of sorting the whole table with ORDER BY random()
+        result = await session.execute(
+            query.order_by(Question.last_used.nulls_first())
+            .limit(UNUSED_CANDIDATE_WINDOW)
+        )
+        candidate_ids = result.scalars().all()
+        if not candidate_ids:
+            return None
+        return await session.get(Question, random.choice(candidate_ids))
             
     async def get_unused_question(self) -> Optional[Dict]:
         """Get a random unused question with category balancing."""
+        questions = await self.get_unused_questions(limit=1)
+        return questions[0] if questions else None
+        
+    async def get_unused_questions(self, limit: int) -> List[Dict]:
+        """Get up to `limit` random unused questions, balanced across categories."""
         async with self.SessionLocal() as session:
-            # First, get the least recently used category
+            # Visit categories from least to most recently used
             category_result = await session.execute(
-                select(Question.category, func.max(Question.last_used))
+                select(Question.category)
                 .group_by(Question.category)
                 .order_by(func.max(Question.last_used).nulls_first())
-                .limit(1)
             )
-            category_row = category_result.first()
+            categories = category_result.scalars().all()
             
-            if category_row:
-                preferred_category = category_row[0]
-                
-                # Try to get a question from the preferred category first
-                result = await session.execute(
-                    select(Question)
-                    .where(
-                        Question.used == False,
-                        Question.category == preferred_category
-                    )
-                    .order_by(func.random())
-                    .limit(1)
-                )
-                question = result.scalar_one_or_none()
-                
-                # If no questions in preferred category, get any unused question
+            picked = []
+            for category in categories:
+                if len(picked) >= limit:
+                    break
+                question = await self._pick_unused_question(session, category)
+                if question:
+                    question.used = True
+                    picked.append(question)
+                    
+            # If the categories ran dry, top up with any unused question
+            while len(picked) < limit:
+                question = await self._pick_unused_question(session)
                 if not question:
-                    result = await session.execute(
-                        select(Question)
-                        .where(Question.used == False)
-                        .order_by(func.random())
-                        .limit(1)
-                    )
-                    question = result.scalar_one_or_none()
-            else:
-                # If no categories found, get any unused question
-                result = await session.execute(
-                    select(Question)
-                    .where(Question.used == False)
-                    .order_by(func.random())
-                    .limit(1)
-                )
-                question = result.scalar_one_or_none()
-            
-            if question:
-                # Mark as used and update timestamp
+                    break
                 question.used = True
-                question.last_used = func.time()
-                await session.commit()
+                picked.append(question)
+            
+            if not picked:
+                return []
                 
-                return {
+            # Update timestamps and commit the whole batch at once
+            for question in picked:
+                question.last_used = func.time()
+            await session.commit()
+            
+            return [
+                {
                     'id': question.question_id,
                     'question': question.question_text,
                     'answer': question.answer,
@@ -228,7 +301,8 @@ class Database:
                     'category': question.category,
                     'difficulty': question.difficulty
                 }
-            return None
+                for question in picked
+            ]
             
     async def reset_used_questions(self):
         """Reset questions state and clean up old/invalid questions."""
@@ -238,6 +312,26 @@ class Database:
             await session.commit()
             logger.info("Cleared all existing questions to ensure fresh content")
             
+    async def release_questions(self, question_ids: List[str]) -> int:
+        """Mark questions handed out but never asked as unused again.
+        
+        Returns the number of questions released.
+        """
+        async with self.SessionLocal() as session:
+            result = await session.execute(
+                update(Question)
+                .where(Question.question_id.in_(question_ids))
+                .values(used=False)
+            )
+            await session.commit()
+            return result.rowcount
+            
+    async def get_question_texts(self) -> List[str]:
+        """Get the text of every stored question."""
+        async with self.SessionLocal() as session:
+            result = await session.execute(select(Question.question_text))
+            return list(result.scalars())
+            
     async def count_questions(self, unused_only: bool = False) -> int:
         """Count total or unused questions in database."""
         async with self.SessionLocal() as session:
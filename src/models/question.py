@@ -1,9 +1,14 @@
 """Question management and tracking."""
+import copy
 import logging
-from typing import Dict, Set, Optional
+import random
+from collections import deque
+from typing import Deque, Dict, Set, Optional
 from datetime import datetime
 import asyncio
 
+from utils.text_processing import match_normalized, normalize_text
+
 logger = logging.getLogger(__name__)
 
 class Question:
@@ -13,10 +18,12 @@ class Question:
         self.id = question_id
         self.question = question
         self.answer = answer
+        # Normalized once here rather than on every guess
+        self.normalized_answer = normalize_text(answer)
         self.fun_fact = fun_fact
         self.category = category
         self.difficulty = difficulty
-        self.asked_at: Optional[datetime] = None
+        self.asked_at: Optional[float] = None  # event loop (monotonic) time
         self.answered_at: Optional[datetime] = None
         self.answered_by: Optional[str] = None
 
@@ -24,10 +31,19 @@ class QuestionManager:
     """Manages quiz questions and their state."""
     def __init__(self, mistral_service):
         self.mistral_service = mistral_service
-        self.used_questions: Set[str] = set()
+        # Hashes of the ids asked this game; a 64-bit collision among a
+        # handful of ids is not a practical concern
+        self.used_questions: Set[int] = set()
         self.current_question: Optional[Question] = None
         self._retry_count = 3
         self._retry_delay = 1  # seconds
+        self._max_delay = 30  # seconds
+        
+        # Questions fetched ahead in batches, refilled in the background
+        self._prefetch: Deque[Dict[str, str]] = deque()
+        self._prefetch_size = 5
+        self._prefetch_low_water = 1
+        self._prefetch_task: Optional[asyncio.Task] = None
         
         # Improved fallback questions with categories and varying difficulty
         self.fallback_questions = [
@@ -88,6 +104,18 @@ class QuestionManager:
                 "fun_fact": "Elephants are the only mammals that can't jump because all four feet must be on the ground at once."
             }
         ]
+        # Prebuilt Question objects, copied on use so per-ask state stays separate
+        self._fallback_pool = tuple(
+            Question(
+                question_id=q["id"],
+                question=q["question"],
+                answer=q["answer"],
+                fun_fact=q["fun_fact"],
+                category=q["category"],
+                difficulty=q["difficulty"]
+            )
+            for q in self.fallback_questions
+        )
         self._fallback_index = 0
 
     async def get_next_question(self) -> Optional[Question]:
@@ -105,23 +133,20 @@ class QuestionManager:
             # If still no question, try fallback
             if question_data is None:
                 logger.warning("No questions available from Mistral, using fallback")
-                question_data = self._get_fallback_question()
+                question = self._get_fallback_question()
+            else:
+                # Create the question with category and difficulty
+                question = Question(
+                    question_id=question_data["id"],
+                    question=question_data["question"],
+                    answer=question_data["answer"],
+                    fun_fact=question_data["fun_fact"],
+                    category=question_data.get("category", "general"),
+                    difficulty=question_data.get("difficulty", 2)
+                )
                 
-            if question_data is None:
-                logger.error("Failed to get question from any source")
-                return None
-                
-            # Create and return the question with category and difficulty
-            self.used_questions.add(question_data["id"])
-            self.current_question = Question(
-                question_id=question_data["id"],
-                question=question_data["question"],
-                answer=question_data["answer"],
-                fun_fact=question_data["fun_fact"],
-                category=question_data.get("category", "general"),
-                difficulty=question_data.get("difficulty", 2)
-            )
-            self.current_question.asked_at = datetime.now()
+            self.used_questions.add(hash(question.id))
+            self.current_question = question
             return self.current_question
             
         except Exception as e:
@@ -133,20 +158,77 @@ class QuestionManager:
         last_error = None
         for attempt in range(self._retry_count):
             try:
-                return await self.mistral_service.generate_question()
+                return await self._next_prefetched_question()
             except Exception as e:
                 last_error = e
                 logger.warning(f"Question generation attempt {attempt + 1} failed: {e}")
                 if attempt < self._retry_count - 1:
-                    await asyncio.sleep(self._retry_delay * (attempt + 1))
+                    # Exponential backoff with jitter so channels don't retry in lockstep
+                    delay = min(self._max_delay, self._retry_delay * (2 ** attempt))
+                    await asyncio.sleep(delay * (0.5 + random.random() * 0.5))
                 
         raise Exception(f"Failed to get question after {self._retry_count} attempts: {last_error}")
 
-    def _get_fallback_question(self) -> Dict[str, str]:
+    async def _next_prefetched_question(self) -> Optional[Dict[str, str]]:
+        """Pop the next unused prefetched question, fetching a batch if needed."""
+        if not self._prefetch and self._prefetch_task and not self._prefetch_task.done():
+            # A background refill is already in flight, wait for it
+            await self._prefetch_task
+            
+        if not self._prefetch:
+            self._prefetch.extend(
+                await self.mistral_service.generate_questions(self._prefetch_size)
+            )
+            
+        question_data = None
+        while self._prefetch and question_data is None:
+            candidate = self._prefetch.popleft()
+            if hash(candidate["id"]) not in self.used_questions:
+                question_data = candidate
+                
+        # Start fetching the next batch while this question is being played
+        if (len(self._prefetch) <= self._prefetch_low_water and
+                (self._prefetch_task is None or self._prefetch_task.done())):
+            self._prefetch_task = asyncio.create_task(self._refill_prefetch())
+            
+        return question_data
+
+    async def _refill_prefetch(self):
+        """Top up the prefetch queue in the background."""
+        try:
+            self._prefetch.extend(
+                await self.mistral_service.generate_questions(self._prefetch_size)
+            )
+        except Exception as e:
+            logger.warning(f"Background question prefetch failed: {e}")
+
+    async def release_prefetched(self):
+        """Hand prefetched questions that were never asked back to the pool.
+        
+        Fetching marks rows used in the database, so anything still queued
+        when a game ends would otherwise never be asked.
+        """
+        task = self._prefetch_task
+        self._prefetch_task = None
+        if task and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+                
+        question_ids = [q["id"] for q in self._prefetch]
+        self._prefetch.clear()
+        try:
+            await self.mistral_service.release_questions(question_ids)
+        except Exception as e:
+            logger.warning(f"Failed to release prefetched questions: {e}")
+
+    def _get_fallback_question(self) -> Question:
         """Get a fallback question from the local collection."""
-        question = self.fallback_questions[self._fallback_index]
-        self._fallback_index = (self._fallback_index + 1) % len(self.fallback_questions)
-        return question
+        question = self._fallback_pool[self._fallback_index]
+        self._fallback_index = (self._fallback_index + 1) % len(self._fallback_pool)
+        return copy.copy(question)
 
     def mark_answered(self, nick: str):
         """Mark the current question as answered."""
@@ -156,9 +238,11 @@ class QuestionManager:
             
     def is_question_used(self, question_id: str) -> bool:
         """Check if a question has been used in the current game."""
-        return question_id in self.used_questions
+        return hash(question_id) in self.used_questions
         
     def clear_used_questions(self):
         """Clear the list of used questions."""
         self.used_questions.clear()
+        # Cached guesses from the finished game won't come up again
+        match_normalized.cache_clear()
         self.current_question = None
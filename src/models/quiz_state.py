@@ -1,8 +1,8 @@
 """Core quiz game state and logic."""
 import logging
 import asyncio
-from datetime import datetime
-from typing import Dict, Optional
+from dataclasses import dataclass
+from typing import Dict, Optional, Set
 
 from models.question import QuestionManager
 from models.database import Database
@@ -10,11 +10,25 @@ from services.irc_service import IRCService
 from services.mistral_service import MistralService
 from utils.scoring import ScoreTracker, calculate_base_points, calculate_streak_multiplier
 from utils.scoring import calculate_speed_multiplier, calculate_final_score
-from utils.text_processing import extract_command, is_answer_match
+from utils.text_processing import extract_command, match_normalized, normalize_text
 
 logger = logging.getLogger(__name__)
 
+# One line of the final scoreboard
+_ROW_FMT = "{rank}. {nick}: {score} points ({correct} correct, best streak: {streak})"
+
+@dataclass(slots=True)
+class _ChannelState:
+    """Per-channel game state."""
+    active: bool = False
+    question_count: int = 0
+    timeout: Optional[asyncio.Task] = None
+    next_handle: Optional[asyncio.TimerHandle] = None
+
 class QuizState:
+    # Chat commands, each handled by the matching cmd_* method
+    _COMMANDS = frozenset({'!quiz', '!help', '!stats', '!leaderboard', '!stop'})
+    
     def __init__(
         self,
         mistral_service: MistralService,
@@ -33,21 +47,12 @@ class QuizState:
         
         self.question_manager = QuestionManager(mistral_service)
         self.score_tracker = ScoreTracker()
-        self.active_games: Dict[str, bool] = {}
-        self.question_counts: Dict[str, int] = {}
-        self.timeout_tasks: Dict[str, asyncio.Task] = {}
+        self._games: Dict[str, _ChannelState] = {}
+        # Strong references to next_question tasks started from timers
+        self._tasks: Set[asyncio.Task] = set()
         
         # Register message handler
-        self.irc_service.add_message_handler(self.handle_message)
-        
-        # Command handlers
-        self.commands = {
-            '!quiz': self.cmd_quiz,
-            '!help': self.cmd_help,
-            '!stats': self.cmd_stats,
-            '!leaderboard': self.cmd_leaderboard,
-            '!stop': self.cmd_stop
-        }
+        self.irc_service.add_message_handler(self.handle_message, self.wants_message)
         
     async def start(self):
         """Start the quiz state."""
@@ -56,23 +61,38 @@ class QuizState:
         
     async def cleanup(self):
         """Cleanup resources."""
-        for task in self.timeout_tasks.values():
-            task.cancel()
+        for game in self._games.values():
+            if game.timeout:
+                game.timeout.cancel()
+            if game.next_handle:
+                game.next_handle.cancel()
+        await self.question_manager.release_prefetched()
         await self.database.disconnect()
         logger.info("Quiz state cleaned up")
         
+    def wants_message(self, channel: str, message: str) -> bool:
+        """Cheap check for whether a chat line needs handling at all."""
+        return message.startswith('!') or self.is_game_active(channel)
+        
     async def handle_message(self, channel: str, nick: str, message: str):
         """Handle incoming IRC messages."""
+        # Most chat lines aren't commands, skip parsing them
+        if not message.startswith('!'):
+            if self.is_game_active(channel):
+                await self.handle_answer(channel, nick, message)
+            return
+            
         command, args = extract_command(message)
         
-        if command in self.commands:
-            await self.commands[command](channel, nick, args)
+        if command in self._COMMANDS:
+            await getattr(self, 'cmd_' + command[1:])(channel, nick, args)
         elif self.is_game_active(channel):
             await self.handle_answer(channel, nick, message)
             
     def is_game_active(self, channel: str) -> bool:
         """Check if a game is active in the channel."""
-        return channel in self.active_games and self.active_games[channel]
+        game = self._games.get(channel)
+        return game is not None and game.active
         
     async def start_game(self, channel: str, starter: str):
         """Start a new quiz game."""
@@ -80,8 +100,7 @@ class QuizState:
             await self.irc_service.send_message(channel, "A game is already in progress!")
             return
             
-        self.active_games[channel] = True
-        self.question_counts[channel] = 0
+        self._games[channel] = _ChannelState(active=True)
         welcome_msg = (
             "🎯 New Quiz Game Starting! | "
             f"Started by: {starter} | "
@@ -93,11 +112,12 @@ class QuizState:
         
     async def next_question(self, channel: str):
         """Get and display the next question."""
-        if not self.is_game_active(channel):
+        game = self._games.get(channel)
+        if game is None or not game.active:
             return
             
         # Check if we've reached the question limit before trying to get a new one
-        if self.question_counts[channel] >= self.questions_per_game:
+        if game.question_count >= self.questions_per_game:
             await self.stop_game(channel)
             return
             
@@ -105,16 +125,18 @@ class QuizState:
             # Try to get next question
             question = await self.question_manager.get_next_question()
             if question:
-                self.question_counts[channel] += 1  # Only increment if we got a question
+                game.question_count += 1  # Only increment if we got a question
                 await self.irc_service.send_message(
                     channel,
-                    f"Question {self.question_counts[channel]}/{self.questions_per_game}: {question.question}"
+                    f"Question {game.question_count}/{self.questions_per_game}: {question.question}"
                 )
+                # Start the clock once the question is actually out
+                question.asked_at = asyncio.get_running_loop().time()
                 
                 # Set timeout
-                if channel in self.timeout_tasks:
-                    self.timeout_tasks[channel].cancel()
-                self.timeout_tasks[channel] = asyncio.create_task(
+                if game.timeout:
+                    game.timeout.cancel()
+                game.timeout = asyncio.create_task(
                     self.handle_timeout(channel)
                 )
             else:
@@ -135,17 +157,18 @@ class QuizState:
             
     async def handle_answer(self, channel: str, nick: str, message: str):
         """Handle a potential answer."""
-        if not self.is_game_active(channel):
+        game = self._games.get(channel)
+        if game is None or not game.active:
             return
             
         current_question = self.question_manager.current_question
-        if not current_question:
+        if not current_question or current_question.asked_at is None:
+            # No question, or it hasn't been sent to the channel yet
             return
             
-        if is_answer_match(message, current_question.answer):
+        if match_normalized(normalize_text(message), current_question.normalized_answer):
             # Calculate score
-            answer_time = datetime.now()
-            time_taken = (answer_time - current_question.asked_at).total_seconds()
+            time_taken = asyncio.get_running_loop().time() - current_question.asked_at
             
             base_points = calculate_base_points()
             player_score = self.score_tracker.get_player_score(nick)
@@ -176,18 +199,18 @@ class QuizState:
             )
             
             # Cancel timeout task
-            if channel in self.timeout_tasks:
-                self.timeout_tasks[channel].cancel()
+            if game.timeout:
+                game.timeout.cancel()
             
-            # Move to next question
-            await asyncio.sleep(3)
-            await self.next_question(channel)
+            # Move to next question after a short pause
+            self._schedule_next(channel, game, 3)
             
     async def handle_timeout(self, channel: str):
         """Handle question timeout."""
         await asyncio.sleep(self.question_timeout)
         
-        if self.is_game_active(channel) and self.question_manager.current_question:
+        game = self._games.get(channel)
+        if game is not None and game.active and self.question_manager.current_question:
             current_question = self.question_manager.current_question
             await self.irc_service.send_message(
                 channel,
@@ -199,54 +222,73 @@ class QuizState:
             for score in self.score_tracker.scores.values():
                 score.current_streak = 0
                 
-            await asyncio.sleep(2)
-            await self.next_question(channel)
+            self._schedule_next(channel, game, 2)
+            
+    def _schedule_next(self, channel: str, game: _ChannelState, delay: float):
+        """Schedule the next question without keeping a coroutine parked."""
+        if game.next_handle:
+            game.next_handle.cancel()
+        game.next_handle = asyncio.get_running_loop().call_later(
+            delay, self._fire_next, channel
+        )
+        
+    def _fire_next(self, channel: str):
+        """Timer callback that starts next_question as a task."""
+        task = asyncio.create_task(self.next_question(channel))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
             
     async def stop_game(self, channel: str):
         """Stop the current game."""
-        if not self.is_game_active(channel):
+        game = self._games.get(channel)
+        if game is None or not game.active:
             return
             
-        self.active_games[channel] = False
-        if channel in self.timeout_tasks:
-            self.timeout_tasks[channel].cancel()
-            del self.timeout_tasks[channel]
+        # Drop the channel state up front so nothing else sees a live game
+        del self._games[channel]
+        game.active = False
+        if game.timeout:
+            game.timeout.cancel()
+        if game.next_handle:
+            game.next_handle.cancel()
             
         # Clear question state
         self.question_manager.clear_used_questions()
+        await self.question_manager.release_prefetched()
             
         # Show final scores
-        sorted_scores = sorted(
-            self.score_tracker.scores.items(),
-            key=lambda x: x[1].total_score,
-            reverse=True
-        )
+        top_scores = self.score_tracker.get_leaderboard(limit=5)
         
-        if sorted_scores:
+        if top_scores:
             message = "🏁 Final Scores: | " + " | ".join(
-                f"{i+1}. {nick}: {score.total_score} points "
-                f"({score.correct_answers} correct, best streak: {score.best_streak})"
-                for i, (nick, score) in enumerate(sorted_scores[:5])
+                _ROW_FMT.format_map({
+                    'rank': rank,
+                    'nick': nick,
+                    'score': score.total_score,
+                    'correct': score.correct_answers,
+                    'streak': score.best_streak
+                })
+                for rank, (nick, score) in enumerate(top_scores, 1)
             )
         else:
             message = "Game ended with no scores!"
             
         await self.irc_service.send_message(channel, message)
         
-        # Update database
-        for nick, score in self.score_tracker.scores.items():
-            await self.database.update_player_stats(
-                nick=nick,
-                score=score.total_score,
-                correct_answers=score.correct_answers,
-                best_streak=score.best_streak,
-                answer_time=score.fastest_answer
-            )
+        # Update database in a single round trip
+        await self.database.update_player_stats_bulk([
+            {
+                'nick': nick,
+                'score': score.total_score,
+                'correct_answers': score.correct_answers,
+                'best_streak': score.best_streak,
+                'answer_time': score.fastest_answer
+            }
+            for nick, score in self.score_tracker.scores.items()
+        ])
             
         # Clear game state
         self.score_tracker.scores.clear()
-        if channel in self.question_counts:
-            del self.question_counts[channel]
             
     async def cmd_quiz(self, channel: str, nick: str, args: str):
         """Handle !quiz command."""
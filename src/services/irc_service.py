@@ -11,6 +11,12 @@ from irc.client import ServerConnection, Event
 
 logger = logging.getLogger(__name__)
 
+_PIPE_RE = re.compile(r'\s+\|\s+')
+_WS_RE = re.compile(r'\s{2,}')
+
+# Maximum payload bytes per PRIVMSG, well under IRC's 512-byte line limit
+MAX_MESSAGE_BYTES = 400
+
 class IRCService:
     """Service for handling IRC communication."""
     
@@ -21,7 +27,9 @@ class IRCService:
         nickname: str = "QuizBot",
         channels: List[str] = None,
         reconnect_delay: int = 30,
-        use_ssl: bool = True
+        use_ssl: bool = True,
+        send_rate: float = 2.0,
+        send_burst: int = 4
     ):
         self.server = server
         self.port = port
@@ -33,9 +41,17 @@ class IRCService:
         self.reactor = irc.client.Reactor()
         self.connection: Optional[ServerConnection] = None
         self.message_callback: Optional[Callable[[str, str, str], Awaitable[None]]] = None
+        self.message_filter: Optional[Callable[[str, str], bool]] = None
         self.connected = False
         self.reconnect_task: Optional[asyncio.Task] = None
         self._event_loop = None
+        self._reader_fd: Optional[int] = None
+        
+        # Outgoing flood control: token bucket refilled at send_rate lines/s
+        self._rate = send_rate
+        self._burst = send_burst
+        self._tokens = float(send_burst)
+        self._last_send = 0.0
         
         # Configure connection timeouts
         self.reactor.scheduler.tick_period = 0.1
@@ -43,10 +59,16 @@ class IRCService:
         
     def add_message_handler(
         self,
-        handler: Callable[[str, str, str], Awaitable[None]]
+        handler: Callable[[str, str, str], Awaitable[None]],
+        message_filter: Optional[Callable[[str, str], bool]] = None
     ):
-        """Add a handler for incoming messages."""
+        """Add a handler for incoming messages.
+        
+        If message_filter(channel, message) is given, lines it rejects are
+        dropped before a task is created for the handler.
+        """
         self.message_callback = handler
+        self.message_filter = message_filter
         
     def _format_irc_message(self, message: str) -> List[str]:
         """Format a message for IRC by handling newlines and long messages."""
@@ -54,16 +76,20 @@ class IRCService:
         message = message.replace('\n', ' | ')
         
         # Clean up any double spaces or separators
-        message = re.sub(r'\s+\|\s+', ' | ', message)
-        message = re.sub(r'\s{2,}', ' ', message)
+        message = _PIPE_RE.sub(' | ', message)
+        message = _WS_RE.sub(' ', message)
         
-        # Split long messages
-        max_length = 400
+        # Split long messages on byte length, since IRC limits bytes not chars
+        data = message.encode('utf-8')
         messages = []
-        for i in range(0, len(message), max_length):
-            part = message[i:i + max_length]
-            if part:
-                messages.append(part)
+        start = 0
+        while start < len(data):
+            end = min(start + MAX_MESSAGE_BYTES, len(data))
+            # Back up so a chunk never ends inside a multi-byte character
+            while end < len(data) and (data[end] & 0xC0) == 0x80:
+                end -= 1
+            messages.append(data[start:end].decode('utf-8'))
+            start = end
                 
         return messages
         
@@ -86,6 +112,7 @@ class IRCService:
                 self.nickname,
                 connect_factory=connect_factory
             )
+            self._watch_socket()
             
             # Set up event handlers
             self.connection.add_global_handler("welcome", self._on_connect)
@@ -102,6 +129,28 @@ class IRCService:
             logger.error(f"Error connecting to IRC server: {e}")
             await self._handle_connection_error()
             
+    def _watch_socket(self):
+        """Have the event loop read the IRC socket as soon as data arrives."""
+        self._unwatch_socket()
+        sock = self.connection.socket
+        # Keep the fd: fileno() returns -1 once the socket is closed
+        self._reader_fd = sock.fileno()
+        self._event_loop.add_reader(self._reader_fd, self._on_readable, sock)
+        
+    def _unwatch_socket(self):
+        """Stop watching the IRC socket."""
+        if self._reader_fd is not None and self._event_loop:
+            self._event_loop.remove_reader(self._reader_fd)
+            self._reader_fd = None
+            
+    def _on_readable(self, sock):
+        """Read and dispatch whatever the server has sent."""
+        self.reactor.process_data([sock])
+        # SSL can hold decrypted bytes that the selector doesn't see
+        pending = getattr(sock, 'pending', None)
+        while pending and getattr(self.connection, 'socket', None) is sock and pending():
+            self.reactor.process_data([sock])
+            
     def _on_connect(self, connection: ServerConnection, event: Event):
         """Handler for successful connection."""
         self.connected = True
@@ -119,17 +168,18 @@ class IRCService:
     def _handle_pubmsg(self, connection: ServerConnection, event: Event):
         """Handle public messages by scheduling them in the event loop."""
         if self.message_callback and self._event_loop:
+            channel = event.target
+            message = event.arguments[0]
+            if self.message_filter and not self.message_filter(channel, message):
+                return
             self._event_loop.create_task(
-                self.message_callback(
-                    event.target,
-                    event.source.nick,
-                    event.arguments[0]
-                )
+                self.message_callback(channel, event.source.nick, message)
             )
                 
     def _on_disconnect(self, connection: ServerConnection, event: Event):
         """Handler for disconnection."""
         self.connected = False
+        self._unwatch_socket()
         logger.warning("Disconnected from IRC server")
         if self._event_loop:
             self._event_loop.create_task(self._handle_disconnect())
@@ -168,6 +218,20 @@ class IRCService:
         logger.error("Failed to connect to IRC server")
         self._schedule_reconnect()
         
+    async def _throttle(self):
+        """Reserve a send slot, sleeping only if the burst budget is spent."""
+        now = asyncio.get_running_loop().time()
+        self._tokens = min(
+            self._burst,
+            self._tokens + (now - self._last_send) * self._rate
+        )
+        self._last_send = now
+        
+        # Tokens may go negative; each waiter sleeps for its own deficit
+        self._tokens -= 1
+        if self._tokens < 0:
+            await asyncio.sleep(-self._tokens / self._rate)
+            
     async def send_message(self, channel: str, message: str):
         """Send a message to a channel."""
         if self.connected and self.connection:
@@ -176,9 +240,9 @@ class IRCService:
                 messages = self._format_irc_message(message)
                 
                 for msg in messages:
+                    # Rate limit lines to avoid flooding
+                    await self._throttle()
                     self.connection.privmsg(channel, msg)
-                    # Small delay between messages to avoid flooding
-                    await asyncio.sleep(0.5)
                     
             except Exception as e:
                 logger.error(f"Error sending message to {channel}: {e}")
@@ -186,9 +250,9 @@ class IRCService:
             logger.warning(f"Cannot send message to {channel}: Not connected")
             
     async def process(self):
-        """Process IRC events."""
-        self.reactor.process_once(timeout=0.1)
-        await asyncio.sleep(0.1)
+        """Run the IRC scheduler; socket reads are driven by the event loop."""
+        self.reactor.process_timeout()
+        await asyncio.sleep(1)
         
     async def disconnect(self):
         """Disconnect from the IRC server."""
@@ -198,6 +262,7 @@ class IRCService:
                     self.connection.part(channel, "Bot shutting down")
                 self.connection.quit("Bot shutting down")
                 self.connected = False
+                self._unwatch_socket()
                 logger.info("Disconnected from IRC server")
             except Exception as e:
                 logger.error(f"Error during disconnect: {e}")
@@ -1,55 +1,117 @@
 """Service for interacting with Mistral AI API."""
 import logging
 import json
-import uuid
+import os
 import httpx
+import orjson
 import random
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Set, Tuple
 import asyncio
-import time
 import re
+from time import monotonic_ns
 from utils.validators import QuestionValidator, ValidationSeverity
 from utils.answer_normalizer import AnswerNormalizer, create_answer_variants
 
 logger = logging.getLogger(__name__)
 
+# Splits free-text responses into question blocks (blank lines or "1. ")
+_RE_BLOCK_SPLIT = re.compile(r'\n\s*\n|\d+\.\s+')
+_RE_WS = re.compile(r'\s+')
+
+# Scans one JSON value out of surrounding prose or code fences
+_DECODER = json.JSONDecoder()
+
+# Upper bounds, in seconds, on a server-requested Retry-After wait and
+# on our own backoff window
+MAX_RETRY_AFTER = 60.0
+MAX_BACKOFF = 60.0
+
+# Categories requested per API call; 3 x 5 questions fits well within max_tokens
+CATEGORIES_PER_REQUEST = 3
+
+# Shared by every generation request; category guidelines are appended
+_BASE_PROMPT = (
+    "You are a trivia question generator specializing in creating clear, engaging, and factual questions. "
+    "Generate trivia questions for each of the requested categories.\n\n"
+    "QUESTION RULES:\n"
+    "1. Questions must be clear, direct, and have a single unambiguous answer\n"
+    "2. Prefer simpler, well-known answers over obscure ones\n"
+    "3. Questions should be interesting but not overly technical\n"
+    "4. For dates, use simple years without 'CE/BCE' unless crucial\n"
+    "5. Accept common variations of answers (e.g., 'Da Vinci' or 'Leonardo da Vinci')\n\n"
+    "FORMAT RULES:\n"
+    "1. Question format: 'What/Who/Where/When/Which/How many [rest of question]?'\n"
+    "2. No trailing punctuation except the question mark\n"
+    "3. Answer format: lowercase, 1-3 words, simplest correct form\n"
+    "4. Fun fact must provide new interesting information\n\n"
+    "EXAMPLES:\n"
+    "Q: Who painted the Mona Lisa?\n"
+    "A: da vinci\n"
+    "Fun fact: The Mona Lisa was painted between 1503 and 1519 and is housed in the Louvre Museum.\n\n"
+    "Q: What is the highest mountain on Earth?\n"
+    "A: everest\n"
+    "Fun fact: Mount Everest grows about 4 millimeters taller every year due to geological uplift.\n\n"
+    "AVOID:\n"
+    "1. Relative time references ('recent', 'modern', 'current')\n"
+    "2. Subjective terms ('best', 'greatest', 'most famous')\n"
+    "3. Multiple choice or true/false questions\n"
+    "4. Compound questions using 'and' or 'or'\n"
+    "5. Overly specific or technical answers\n"
+)
+
+def _decode_embedded_json(content: str, opener: str):
+    """Decode the response as JSON, or the first JSON value starting at opener."""
+    try:
+        return orjson.loads(content)
+    except orjson.JSONDecodeError:
+        pass
+    idx = content.find(opener)
+    if idx == -1:
+        return None
+    try:
+        return _DECODER.raw_decode(content, idx)[0]
+    except json.JSONDecodeError:
+        return None
+
+def _question_key(text: str) -> int:
+    """Hash of a question's text, ignoring case and spacing."""
+    return hash(' '.join(text.lower().split()))
+
 class TokenBucket:
-    """Token bucket rate limiter implementation."""
+    """Token bucket rate limiter (GCRA; no lock needed)."""
     def __init__(self, tokens_per_second: float, max_tokens: int):
         self.tokens_per_second = tokens_per_second
         self.max_tokens = max_tokens
-        self.tokens = max_tokens
-        self.last_update = time.time()
-        self.lock = asyncio.Lock()
+        # Integer nanoseconds, so long runs don't drift
+        self.ns_per_token = int(1e9 / tokens_per_second)
+        # How far ahead of the steady rate a burst may run
+        self.burst_ns = (max_tokens - 1) * self.ns_per_token
+        self.next_free_ns = monotonic_ns()
 
     async def acquire(self):
         """Acquire a token, waiting if necessary."""
-        async with self.lock:
-            while self.tokens <= 0:
-                now = time.time()
-                time_passed = now - self.last_update
-                self.tokens = min(
-                    self.max_tokens,
-                    self.tokens + time_passed * self.tokens_per_second
-                )
-                self.last_update = now
-                if self.tokens <= 0:
-                    await asyncio.sleep(1.0 / self.tokens_per_second)
-
-            self.tokens -= 1
-            self.last_update = time.time()
+        now = monotonic_ns()
+        slot = max(self.next_free_ns, now)
+        self.next_free_ns = slot + self.ns_per_token
+        wait = slot - now - self.burst_ns
+        if wait > 0:
+            await asyncio.sleep(wait / 1e9)
 
 class MistralService:
     """Service for generating quiz questions using Mistral AI."""
 
     def __init__(self, api_key: str, database, min_questions: int = 30):
         self.api_key = api_key
-        self.api_url = "https://api.mistral.ai/v1/chat/completions"
+        self.base_url = "https://api.mistral.ai"
+        self.api_path = "/v1/chat/completions"
         self.headers = {
             "Authorization": f"Bearer {api_key}",
             "Content-Type": "application/json"
         }
-        self.reset_lock = asyncio.Lock()
+        # Set while used questions are being reset; others wait on the event
+        self._resetting = False
+        self._reset_done = asyncio.Event()
+        self._reset_done.set()
         self.default_model = "mistral-tiny"
         self.default_timeout = 20.0
         self.max_retries = 5
@@ -57,6 +119,9 @@ class MistralService:
         self.min_questions = min_questions
         self.database = database
 
+        # Long-lived HTTP client, opened in start() and closed in stop()
+        self._client: Optional[httpx.AsyncClient] = None
+
         # Rate limiter: 0.5 requests per second, max burst of 5
         self.rate_limiter = TokenBucket(tokens_per_second=0.5, max_tokens=5)
 
@@ -212,53 +277,65 @@ class MistralService:
             }
         ]
 
+        # The examples never change, so serialize them once
+        self._examples_json = {
+            category['name']: orjson.dumps(category['examples'], option=orjson.OPT_INDENT_2).decode()
+            for category in self.categories
+        }
+        # Finished prompt messages, keyed by the sorted category names of a group
+        self._prompt_cache: Dict[Tuple[str, ...], List[Dict]] = {}
+        # Category guidelines never change either
+        self._category_prompts = {
+            category['name']: self._get_category_specific_prompt(category)
+            for category in self.categories
+        }
+
         self._fill_task: Optional[asyncio.Task] = None
         self._running = False
+        # Set by stop() so backoff waits in the fill loop end at once
+        self._stop_event = asyncio.Event()
+        # Batch generation currently running, shared by everyone who needs one
+        self._gen_inflight: Optional[asyncio.Task] = None
+        # Woken by consumers when the unused pool runs low
+        self._low_water = asyncio.Event()
+        self._unused_estimate = 0
+        # Hashes of every question text in the database, so repeats the
+        # model produces are dropped before the database round trip. Only
+        # written on the event loop; processing threads just read it
+        self._seen_hashes: Set[int] = set()
+
+    def _get_question_generation_prompt(self, group: List[Dict]) -> List[Dict]:
+        """Build the messages asking for questions in every category of a group."""
+        # Sorted so a group maps to one cache entry whatever the shuffle order
+        names = tuple(sorted(category['name'] for category in group))
+        messages = self._prompt_cache.get(names)
+        if messages is not None:
+            return messages
+            
+        # Assemble the example object from the per-category JSON built in __init__
+        examples = "{\n" + ",\n".join(
+            f'"{name}": {self._examples_json[name]}' for name in names
+        ) + "\n}"
 
-    def _get_question_generation_prompt(self, category: Dict) -> List[Dict]:
-        base_prompt = (
-            "You are a trivia question generator specializing in creating clear, engaging, and factual questions. "
-            f"Generate trivia questions in the category: {category['name']}.\n\n"
-            "QUESTION RULES:\n"
-            "1. Questions must be clear, direct, and have a single unambiguous answer\n"
-            "2. Prefer simpler, well-known answers over obscure ones\n"
-            "3. Questions should be interesting but not overly technical\n"
-            "4. For dates, use simple years without 'CE/BCE' unless crucial\n"
-            "5. Accept common variations of answers (e.g., 'Da Vinci' or 'Leonardo da Vinci')\n\n"
-            "FORMAT RULES:\n"
-            "1. Question format: 'What/Who/Where/When/Which/How many [rest of question]?'\n"
-            "2. No trailing punctuation except the question mark\n"
-            "3. Answer format: lowercase, 1-3 words, simplest correct form\n"
-            "4. Fun fact must provide new interesting information\n\n"
-            "EXAMPLES:\n"
-            "Q: Who painted the Mona Lisa?\n"
-            "A: da vinci\n"
-            "Fun fact: The Mona Lisa was painted between 1503 and 1519 and is housed in the Louvre Museum.\n\n"
-            "Q: What is the highest mountain on Earth?\n"
-            "A: everest\n"
-            "Fun fact: Mount Everest grows about 4 millimeters taller every year due to geological uplift.\n\n"
-            "AVOID:\n"
-            "1. Relative time references ('recent', 'modern', 'current')\n"
-            "2. Subjective terms ('best', 'greatest', 'most famous')\n"
-            "3. Multiple choice or true/false questions\n"
-            "4. Compound questions using 'and' or 'or'\n"
-            "5. Overly specific or technical answers\n"
-        )
-
-        return [
+        messages = self._prompt_cache[names] = [
             {
                 "role": "system",
-                "content": base_prompt + self._get_category_specific_prompt(category)
+                "content": _BASE_PROMPT + "".join(self._category_prompts[name] for name in names)
             },
             {
                 "role": "assistant",
-                "content": json.dumps(category['examples'], indent=2)
+                "content": examples
             },
             {
                 "role": "user",
-                "content": f"Generate 5 high-quality {category['name']} questions following the format and rules exactly."
+                "content": (
+                    f"Generate 5 high-quality questions for each of these categories: {', '.join(names)}. "
+                    "Reply with a JSON object mapping each category name to its list of questions, "
+                    "following the format and rules exactly."
+                )
             }
         ]
+        return messages
 
     def _get_category_specific_prompt(self, category: Dict) -> str:
         """Generate category-specific prompt additions with improved specificity."""
@@ -282,27 +359,24 @@ KEY REQUIREMENTS:
 5. Focus on interesting but not obscure information
 """
 
-    async def _parse_response(self, content: str) -> List[Dict]:
+    def _parse_response(self, content: str) -> List[Dict]:
         """Parse and clean the API response with improved handling."""
         questions = []
         
         logger.debug(f"Raw content to parse: {content}")
         
-        # First try to parse as JSON
-        try:
-            json_data = json.loads(content)
-            if isinstance(json_data, list):
-                for item in json_data:
-                    if isinstance(item, dict) and 'question' in item and 'answer' in item:
-                        questions.append(item)
-                if questions:
-                    return questions
-        except json.JSONDecodeError:
-            pass
+        # First try to parse as JSON, possibly wrapped in prose or a code fence
+        json_data = _decode_embedded_json(content, '[')
+        if isinstance(json_data, list):
+            for item in json_data:
+                if isinstance(item, dict) and 'question' in item and 'answer' in item:
+                    questions.append(item)
+            if questions:
+                return questions
         
         # If not JSON, try parsing text format
         # Split content into blocks by numbers or double newlines
-        blocks = re.split(r'\n\s*\n|\d+\.\s+', content)
+        blocks = _RE_BLOCK_SPLIT.split(content)
         
         for block in blocks:
             block = block.strip()
@@ -351,23 +425,57 @@ KEY REQUIREMENTS:
                 
         return questions
     
+    def _parse_group_response(self, content: str, group: List[Dict]) -> Dict[str, List[Dict]]:
+        """Split a multi-category response into questions per category name."""
+        names = [category['name'] for category in group]
+        
+        json_data = _decode_embedded_json(content, '{')
+        if isinstance(json_data, dict):
+            # Models don't always keep the category names' case
+            by_key = {str(key).lower(): value for key, value in json_data.items()}
+            # A bare question object (e.g. the first item of a fenced array)
+            # is a dict too; only a map keyed by our categories counts
+            if any(name.lower() in by_key for name in names):
+                return {
+                    name: [
+                        item for item in by_key.get(name.lower()) or []
+                        if isinstance(item, dict) and 'question' in item and 'answer' in item
+                    ]
+                    for name in names
+                }
+            
+        # The model ignored the requested shape; fall back to the flat parser
+        # and trust a per-item category if it gave one
+        by_category = {name: [] for name in names}
+        lowered = {name.lower(): name for name in names}
+        for item in self._parse_response(content):
+            category = lowered.get(str(item.get('category', '')).lower(), names[0])
+            by_category[category].append(item)
+        return by_category
+
     def _validate_and_clean_question(self, question_data: Dict) -> Optional[Dict]:
         """Validate and clean a question before adding to database."""
         try:
-            # Basic structure validation
-            if not all(k in question_data for k in ['question', 'answer', 'fun_fact']):
+            # Basic structure validation: cheap lookups and lengths first,
+            # strip only records that get past them
+            question = question_data.get('question')
+            answer = question_data.get('answer')
+            fun_fact = question_data.get('fun_fact')
+            if not question or not answer or fun_fact is None:
                 return None
 
-            question = question_data['question'].strip()
-            answer = question_data['answer'].strip()
-            fun_fact = question_data['fun_fact'].strip()
+            question = question.strip()
+            answer = answer.strip()
+            if not question or not answer:
+                return None
+            fun_fact = fun_fact.strip()
 
             # Question format validation
             if not question.endswith('?'):
                 question += '?'
             
             # Answer format validation
-            answer = re.sub(r'\s+', ' ', answer)  # Normalize whitespace
+            answer = _RE_WS.sub(' ', answer)  # Normalize whitespace
             
             # Fun fact validation - ensure it's not empty and different from question
             if not fun_fact or fun_fact.lower() in question.lower():
@@ -386,131 +494,250 @@ KEY REQUIREMENTS:
             logger.warning(f"Question validation failed: {str(e)}")
             return None
 
+    def _process_group_response(
+        self,
+        content: str,
+        group: List[Dict],
+        existing: List[Dict],
+        limit: int
+    ) -> List[Dict[str, str]]:
+        """Parse a response and process the questions for each category in the group."""
+        parsed = self._parse_group_response(content, group)
+        group_questions = []
+        for category in group:
+            questions = parsed[category['name']]
+            logger.info(f"Generated {len(questions)} questions for category: {category['name']}")
+            group_questions.extend(self._process_questions(
+                questions,
+                category,
+                existing + group_questions,
+                limit
+            ))
+        return group_questions
+
+    def _process_questions(
+        self,
+        questions: List[Dict],
+        category: Dict,
+        existing: List[Dict],
+        limit: int
+    ) -> List[Dict[str, str]]:
+        """Validate, clean and dedupe raw questions for one category."""
+        # Validation and cleaning look at one record each, so run them as a
+        # single comprehension; dedupe below needs the running list
+        cleaned = [
+            c for q in questions
+            if self._is_valid_question(q) and (c := self._validate_and_clean_question(q))
+        ]
+        if len(cleaned) < len(questions):
+            logger.warning(
+                f"Dropped {len(questions) - len(cleaned)} invalid questions "
+                f"for category: {category['name']}"
+            )
+            
+        category_questions = []
+        # Random bytes for every candidate's ID in one read, sliced per question
+        id_bytes = os.urandom(16 * len(cleaned))
+        for i, cleaned_question in enumerate(cleaned):
+            try:
+                # Skip questions already in the database (read-only here,
+                # this runs in a worker thread)
+                if _question_key(cleaned_question['question']) in self._seen_hashes:
+                    continue
+
+                # Add category and generate ID
+                cleaned_question['category'] = category['name']
+                cleaned_question['id'] = id_bytes[i * 16:(i + 1) * 16].hex()
+                
+                # Add answer variants
+                cleaned_question['answer'] = self.normalizer.normalize_answer(
+                    cleaned_question['answer'],
+                    category['name']
+                )
+                cleaned_question['answer_variants'] = create_answer_variants(
+                    cleaned_question['answer']
+                )
+
+                # Check for duplicates
+                is_duplicate = any(
+                    vq['question'].lower() == cleaned_question['question'].lower() or 
+                    vq['answer'].lower() == cleaned_question['answer'].lower()
+                    for vq in existing + category_questions
+                )
+                
+                if not is_duplicate:
+                    category_questions.append(cleaned_question)
+                    if len(category_questions) >= limit:
+                        break
+
+            except Exception as e:
+                logger.warning(f"Failed to process question: {str(e)}")
+                continue
+                
+        return category_questions
+
+    def _is_valid_question(self, question_data: Dict) -> bool:
+        """Check a raw question against the validator, without raising."""
+        try:
+            issues = self.validator.validate_question(question_data, fail_fast=True)
+        except Exception as e:
+            logger.debug(f"Question validation raised: {str(e)}")
+            return False
+        errors = [i for i in issues if i.severity == ValidationSeverity.ERROR]
+        if errors:
+            logger.debug(f"Skipping invalid question due to: {errors}")
+            return False
+        return True
+
     async def _generate_batch(self, count: int) -> List[Dict[str, str]]:
         """Generate a batch of questions with balanced categories."""
         valid_questions = []
         questions_per_category = max(2, count // len(self.categories))
         
-        # Shuffle categories for variety
+        # Shuffle categories for variety, then ask for several in each API call
         categories = list(self.categories)
         random.shuffle(categories)
+        groups = [
+            categories[i:i + CATEGORIES_PER_REQUEST]
+            for i in range(0, len(categories), CATEGORIES_PER_REQUEST)
+        ]
         
-        for category in categories:
-            if len(valid_questions) >= count:
-                break
+        # Requests for the groups run concurrently; the rate limiter still
+        # spaces out the calls, but one response's latency hides the next
+        seen_questions = set()
+        seen_answers = set()
+        while groups and len(valid_questions) < count:
+            missing = count - len(valid_questions)
+            wave_size = -(-missing // (questions_per_category * CATEGORIES_PER_REQUEST))
+            wave, groups = groups[:wave_size], groups[wave_size:]
+            results = await asyncio.gather(
+                *(self._generate_group(group, questions_per_category) for group in wave),
+                return_exceptions=True
+            )
+            for result in results:
+                if isinstance(result, BaseException):
+                    logger.error(f"Batch generation error: {str(result)}")
+                    continue
+                # Groups were generated independently, so dedupe across them here
+                for q in result:
+                    question_key = q['question'].lower()
+                    answer_key = q['answer'].lower()
+                    if question_key in seen_questions or answer_key in seen_answers:
+                        continue
+                    seen_questions.add(question_key)
+                    seen_answers.add(answer_key)
+                    valid_questions.append(q)
+
+        return valid_questions[:count]
+
+    async def _generate_group(self, group: List[Dict], questions_per_category: int) -> List[Dict[str, str]]:
+        """Request and process questions for one group of categories, with retries."""
+        for attempt in range(self.max_retries):
+            try:
+                await self.rate_limiter.acquire()
+                messages = self._get_question_generation_prompt(group)
                 
-            category_questions = []
-            for attempt in range(self.max_retries):
-                try:
-                    await self.rate_limiter.acquire()
-                    messages = self._get_question_generation_prompt(category)
-                    
-                    async with httpx.AsyncClient() as client:
-                        response = await client.post(
-                            self.api_url,
-                            headers=self.headers,
-                            json={
-                                "model": "mistral-medium",  # Use more capable model
-                                "messages": messages,
-                                "temperature": 0.7,  # Slightly lower for more focused responses
-                                "max_tokens": 2000,  # Increased token limit
-                                "top_p": 0.95,  # Slightly higher for more variety
-                                "response_format": {"type": "text"}  # Ensure text format
-                            },
-                            timeout=self.default_timeout
-                        )
-
-                        if response.status_code != 200:
-                            logger.error(f"Mistral API error: {response.text}")
-                            if attempt < self.max_retries - 1:
-                                await asyncio.sleep(self.base_retry_delay * (2 ** attempt))
-                            continue
-
-                        data = response.json()
-                        content = data['choices'][0]['message']['content']
-                        
-                        # Parse and validate questions
-                        questions = await self._parse_response(content)
-                        logger.info(f"Generated {len(questions)} questions for category: {category['name']}")
-                        
-                        for q in questions:
-                            try:
-                                # Validate the question
-                                validation_issues = self.validator.validate_question(q)
-                                errors = [i for i in validation_issues if i.severity == ValidationSeverity.ERROR]
-
-                                if errors:
-                                    logger.warning(f"Skipping invalid question due to: {errors}")
-                                    continue
-
-                                # Clean and normalize the question
-                                cleaned_question = self._validate_and_clean_question(q)
-                                if not cleaned_question:
-                                    continue
-
-                                # Add category and generate ID
-                                cleaned_question['category'] = category['name']
-                                cleaned_question['id'] = str(uuid.uuid4())
-                                
-                                # Add answer variants
-                                cleaned_question['answer'] = self.normalizer.normalize_answer(
-                                    cleaned_question['answer'],
-                                    category['name']
-                                )
-                                cleaned_question['answer_variants'] = create_answer_variants(
-                                    cleaned_question['answer']
-                                )
-
-                                # Check for duplicates
-                                is_duplicate = any(
-                                    vq['question'].lower() == cleaned_question['question'].lower() or 
-                                    vq['answer'].lower() == cleaned_question['answer'].lower()
-                                    for vq in valid_questions + category_questions
-                                )
-                                
-                                if not is_duplicate:
-                                    category_questions.append(cleaned_question)
-                                    if len(category_questions) >= questions_per_category:
-                                        break
-
-                            except Exception as e:
-                                logger.warning(f"Failed to process question: {str(e)}")
-                                continue
-
-                        if category_questions:
-                            valid_questions.extend(category_questions[:questions_per_category])
-                            break
-
-                except Exception as e:
-                    logger.error(f"Batch generation error: {str(e)}")
+                response = await self._client.post(
+                    self.api_path,
+                    json={
+                        "model": "mistral-medium",  # Use more capable model
+                        "messages": messages,
+                        "temperature": 0.7,  # Slightly lower for more focused responses
+                        "max_tokens": 2000,  # Increased token limit
+                        "top_p": 0.95,  # Slightly higher for more variety
+                        "response_format": {"type": "text"}  # Ensure text format
+                    }
+                )
+
+                if response.status_code != 200:
+                    # 5xx bodies can be whole HTML pages; only decode the head
+                    logger.error(
+                        "Mistral API error %s: %s",
+                        response.status_code,
+                        response.content[:500].decode('utf-8', 'replace')
+                    )
+                    if 400 <= response.status_code < 500 and response.status_code != 429:
+                        # Bad request or auth failure; retrying won't help
+                        break
                     if attempt < self.max_retries - 1:
-                        await asyncio.sleep(self.base_retry_delay * (2 ** attempt))
+                        await asyncio.sleep(self._retry_delay(attempt, response))
                     continue
 
-        return valid_questions[:count]
+                # Parse the buffered body bytes directly, skipping the str decode
+                data = orjson.loads(response.content)
+                content = data['choices'][0]['message']['content']
+                
+                # Parsing and validation are CPU-bound, keep them off the event loop
+                group_questions = await asyncio.to_thread(
+                    self._process_group_response,
+                    content,
+                    group,
+                    [],
+                    questions_per_category
+                )
+
+                if group_questions:
+                    return group_questions
+
+            except Exception as e:
+                logger.error(f"Batch generation error: {str(e)}")
+                if attempt < self.max_retries - 1:
+                    await asyncio.sleep(self._retry_delay(attempt))
+                continue
+
+        return []
+
+    def _retry_delay(self, attempt: int, response: Optional[httpx.Response] = None) -> float:
+        """Seconds to wait before retrying, preferring the server's Retry-After."""
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after:
+                try:
+                    return min(max(float(retry_after), 0.0), MAX_RETRY_AFTER)
+                except ValueError:
+                    pass  # HTTP-date form; fall back to our own backoff
+        # Full jitter: anywhere in the window, so restarted bots don't retry in lockstep
+        return random.uniform(0, min(self.base_retry_delay * (2 ** attempt), MAX_BACKOFF))
     
     async def start(self):
         """Start the service and ensure minimum questions available."""
         logger.info("Starting Mistral service...")
 
-        async with self.reset_lock:
-            total = await self.database.count_questions()
-            unused = await self.database.count_questions(unused_only=True)
-            logger.info(f"Current questions in database: {total} total, {unused} unused")
+        # One pooled client so connections (and TLS sessions) are reused;
+        # generation is rate limited, so a small pool is plenty. Idle
+        # connections outlive the fill loop's backoff instead of httpx's 5s default
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers=self.headers,
+            timeout=self.default_timeout,
+            http2=True,
+            limits=httpx.Limits(
+                max_keepalive_connections=4,
+                max_connections=8,
+                keepalive_expiry=60
+            )
+        )
+
+        # One read both seeds the duplicate filter and gives the total
+        texts = await self.database.get_question_texts()
+        self._seen_hashes = {_question_key(text) for text in texts}
+        total = len(texts)
+        unused = await self.database.count_questions(unused_only=True)
+        logger.info(f"Current questions in database: {total} total, {unused} unused")
 
-            if total > 0 and unused == 0:
-                logger.info("Resetting all questions to unused")
-                await self.database.reset_used_questions()
-                unused = total
+        if total > 0 and unused == 0:
+            logger.info("Resetting all questions to unused")
+            await self._reset_used_questions()
+            unused = total
 
-            if unused < self.min_questions:
-                logger.info("Generating initial batch of questions...")
-                questions = await self._generate_batch(10)
-                if questions:
-                    added = await self.database.add_questions(questions)
-                    logger.info(f"Added {added} questions to database")
+        if unused < self.min_questions:
+            logger.info("Generating initial batch of questions...")
+            added = await self._generate_and_store(10)
+            if added:
+                logger.info(f"Added {added} questions to database")
 
         self._running = True
+        self._stop_event.clear()
         self._fill_task = asyncio.create_task(self._fill_loop())
         logger.info("Question fill task started")
 
@@ -518,61 +745,156 @@ KEY REQUIREMENTS:
         """Stop the service and cleanup."""
         logger.info("Stopping Mistral service...")
         self._running = False
-        if self._fill_task:
-            self._fill_task.cancel()
+        self._stop_event.set()
+        # Let cancelled tasks unwind before the client they use goes away
+        for task in (self._fill_task, self._gen_inflight):
+            if task and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except (asyncio.CancelledError, Exception):
+                    pass
+        self._fill_task = None
+        if self._client:
+            await self._client.aclose()
+            self._client = None
 
     async def generate_question(self) -> Optional[Dict[str, str]]:
         """Get a question from the database, generating new ones if needed."""
         question = await self.database.get_unused_question()
         if question:
+            self._note_consumed(1)
             return question
 
-        async with self.reset_lock:
-            question = await self.database.get_unused_question()
-            if question:
-                return question
-
+        # A miss means the pool is certainly low
+        self._low_water.set()
+        if not self._resetting:
             logger.info("No unused questions, resetting used status")
-            await self.database.reset_used_questions()
+        await self._reset_used_questions()
+        question = await self.database.get_unused_question()
+        if question:
+            return question
+
+        logger.warning("No questions available after reset, generating new batch...")
+        if await self._generate_and_store(5):
             question = await self.database.get_unused_question()
             if question:
                 return question
 
-            logger.warning("No questions available after reset, generating new batch...")
-            questions = await self._generate_batch(5)
-            if questions:
-                await self.database.add_questions(questions)
-                question = await self.database.get_unused_question()
-                if question:
-                    return question
+        logger.error("Failed to get or generate any questions")
+        return None
 
-            logger.error("Failed to get or generate any questions")
-            return None
+    def _note_consumed(self, count: int):
+        """Track questions handed out and wake the fill loop when running low."""
+        self._unused_estimate -= count
+        if self._unused_estimate < self.min_questions:
+            self._low_water.set()
+
+    async def _reset_used_questions(self):
+        """Reset used questions, or wait for a reset that's already running."""
+        if self._resetting:
+            await self._reset_done.wait()
+            return
+            
+        # Flag is set before the first await, so only one caller resets
+        self._resetting = True
+        self._reset_done.clear()
+        try:
+            await self.database.reset_used_questions()
+            # The reset empties the table, so earlier questions may come back
+            self._seen_hashes.clear()
+        finally:
+            self._resetting = False
+            self._reset_done.set()
+
+    async def generate_questions(self, count: int) -> List[Dict[str, str]]:
+        """Get up to `count` questions in one database round trip."""
+        questions = await self.database.get_unused_questions(limit=count)
+        if questions:
+            self._note_consumed(len(questions))
+            return questions
+            
+        # Nothing unused left; fall back to the reset/generate path
+        question = await self.generate_question()
+        return [question] if question else []
+
+    async def release_questions(self, question_ids: List[str]):
+        """Return fetched but unasked questions to the unused pool."""
+        if not question_ids:
+            return
+        released = await self.database.release_questions(question_ids)
+        self._unused_estimate += released
+
+    async def _generate_and_store(self, count: int) -> int:
+        """Generate and store a batch, joining one already in flight.
+        
+        Returns the number of questions added.
+        """
+        inflight = self._gen_inflight
+        if inflight is None:
+            inflight = self._gen_inflight = asyncio.create_task(self._generate_and_add(count))
+            inflight.add_done_callback(self._clear_inflight)
+        # Shield so one cancelled waiter doesn't cancel the batch for the rest
+        return await asyncio.shield(inflight)
+
+    async def _generate_and_add(self, count: int) -> int:
+        """Generate a batch and add it to the database."""
+        questions = await self._generate_batch(count)
+        if not questions:
+            return 0
+        added = await self.database.add_questions(questions)
+        self._remember_stored(questions)
+        return added
+
+    def _remember_stored(self, questions: List[Dict]):
+        """Record questions handed to the database as seen.
+        
+        Ones add_questions skipped duplicate a stored row, so they count too.
+        """
+        self._seen_hashes.update(_question_key(q['question']) for q in questions)
+
+    def _clear_inflight(self, task: asyncio.Task):
+        """Forget a finished batch so the next caller starts a fresh one."""
+        if self._gen_inflight is task:
+            self._gen_inflight = None
 
     async def _fill_loop(self):
-        """Background loop to keep database filled with questions."""
+        """Background loop to keep database filled with questions.
+        
+        Batches go through _generate_and_store, so a miss in
+        generate_question joins the batch already running instead of
+        starting a second one. When the pool is full the loop sleeps
+        until _low_water is set.
+        """
         while self._running:
             try:
-                async with self.reset_lock:
-                    unused = await self.database.count_questions(unused_only=True)
-                    if unused < self.min_questions:
-                        logger.info(f"Generating more questions (currently {unused} unused)")
-                        questions = await self._generate_batch(10)
-                        if questions:
-                            added = await self.database.add_questions(questions)
-                            if added > 0:
-                                logger.info(f"Added {added} new questions to database")
-                                await asyncio.sleep(5)
-                            else:
-                                await asyncio.sleep(30)
-                        else:
-                            await asyncio.sleep(30)
+                # Clear first so a wake-up during the count isn't lost
+                self._low_water.clear()
+                unused = await self.database.count_questions(unused_only=True)
+                self._unused_estimate = unused
+                if unused < self.min_questions:
+                    logger.info(f"Generating more questions (currently {unused} unused)")
+                    added = await self._generate_and_store(10)
+                    if added > 0:
+                        logger.info(f"Added {added} new questions to database")
+                        await self._wait(5)
                     else:
-                        await asyncio.sleep(60)
+                        # Nothing generated, or all duplicates; back off
+                        await self._wait(30)
+                else:
+                    # Nothing to do until consumers drain the pool
+                    await self._low_water.wait()
 
             except Exception as e:
                 logger.error(f"Error in question fill loop: {e}")
-                await asyncio.sleep(30)
+                await self._wait(30)
+
+    async def _wait(self, seconds: float):
+        """Sleep for up to seconds, returning early if the service is stopped."""
+        try:
+            await asyncio.wait_for(self._stop_event.wait(), seconds)
+        except asyncio.TimeoutError:
+            pass
 
     def _preprocess_question_answer(self, question_data: Dict) -> Dict:
         """Preprocess and normalize question/answer data."""
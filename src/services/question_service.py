@@ -8,6 +8,9 @@ from mistralai.models.chat import ChatMessage, Role
 
 logger = logging.getLogger(__name__)
 
+# Keys every generated question must carry
+_REQUIRED_KEYS = frozenset(("id", "question", "answer", "fun_fact"))
+
 class QuestionService:
     def __init__(self, api_key: str):
         self.client = MistralClient(api_key=api_key)
@@ -69,8 +72,7 @@ class QuestionService:
             question_data = json.loads(response_content)
 
             # Validate the response format
-            required_keys = {"id", "question", "answer", "fun_fact"}
-            if not all(key in question_data for key in required_keys):
+            if not _REQUIRED_KEYS <= question_data.keys():
                 raise ValueError("Invalid question format from Mistral")
 
             return question_data
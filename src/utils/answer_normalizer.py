@@ -6,6 +6,11 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+_RE_WS = re.compile(r'\s+')
+_RE_NONWORD = re.compile(r'[^\w\s]')
+_RE_ERA_SUFFIX = re.compile(r'\s*(CE|BCE|AD|BC)$')
+_RE_CENTURY = re.compile(r'(\d+)(st|nd|rd|th)\s+century')
+
 class AnswerNormalizer:
     """Enhanced answer normalizer with improved flexibility and internationalization."""
     
@@ -72,6 +77,21 @@ class AnswerNormalizer:
             'theater': ['theatre', 'drama', 'stage performance'],
             'martial arts': ['kung fu', 'karate', 'judo', 'taekwondo']
         }
+        
+        # Reverse lookups (variation -> main term) so normalization is a
+        # single dict probe instead of a scan over every variation list
+        self._sport_lookup = self._build_reverse_lookup(self.sport_variations)
+        self._geo_lookup = self._build_reverse_lookup(self.geo_variations)
+        self._cultural_lookup = self._build_reverse_lookup(self.cultural_variations)
+
+    @staticmethod
+    def _build_reverse_lookup(variations: Dict[str, list]) -> Dict[str, str]:
+        """Map each variation to its main term, keeping the first match."""
+        lookup = {}
+        for main_term, terms in variations.items():
+            for term in terms:
+                lookup.setdefault(term, main_term)
+        return lookup
 
     def normalize_answer(self, answer: str, category: str, metadata: Dict = None) -> str:
         """Normalize an answer with enhanced flexibility and context awareness."""
@@ -79,7 +99,7 @@ class AnswerNormalizer:
         metadata = metadata or {}
         
         # Basic cleanup
-        answer = re.sub(r'\s+', ' ', answer)  # Normalize whitespace
+        answer = _RE_WS.sub(' ', answer)  # Normalize whitespace
         answer = answer.replace('_', ' ')      # Replace underscores
         
         # Category-specific normalization
@@ -114,18 +134,14 @@ class AnswerNormalizer:
             return f"{range_low:.1f}-{range_high:.1f}"
             
         # Handle sport name variations
-        for main_name, variations in self.sport_variations.items():
-            if answer in variations:
-                return main_name
-                
-        return answer
+        return self._sport_lookup.get(answer, answer)
 
     def _normalize_geography_answer(self, answer: str) -> str:
         """Enhanced geography answer normalization."""
         # Check for country/region variations
-        for main_name, variations in self.geo_variations.items():
-            if answer in variations:
-                return main_name
+        main_name = self._geo_lookup.get(answer)
+        if main_name:
+            return main_name
                 
         # Handle desert names correctly
         if 'desert' in answer:
@@ -143,7 +159,7 @@ class AnswerNormalizer:
     def _normalize_history_answer(self, answer: str) -> str:
         """Enhanced history answer normalization."""
         # Remove CE/BCE/AD/BC and standardize years
-        answer = re.sub(r'\s*(CE|BCE|AD|BC)$', '', answer)
+        answer = _RE_ERA_SUFFIX.sub('', answer)
         
         # Handle date ranges
         if '-' in answer and all(part.strip().isdigit() for part in answer.split('-')):
@@ -151,7 +167,7 @@ class AnswerNormalizer:
             return f"{start.strip()}-{end.strip()}"
             
         # Handle centuries
-        century_match = re.match(r'(\d+)(st|nd|rd|th)\s+century', answer)
+        century_match = _RE_CENTURY.match(answer)
         if century_match:
             num = int(century_match.group(1))
             return f"{num}th century"
@@ -169,10 +185,7 @@ class AnswerNormalizer:
     def _normalize_arts_answer(self, answer: str) -> str:
         """Normalize arts and culture answers."""
         # Handle cultural variations
-        for main_term, variations in self.cultural_variations.items():
-            if answer in variations:
-                return main_term
-        return answer
+        return self._cultural_lookup.get(answer, answer)
 
     def _normalize_entertainment_answer(self, answer: str) -> str:
         """Normalize entertainment answers."""
@@ -184,9 +197,8 @@ class AnswerNormalizer:
     def _normalize_food_answer(self, answer: str) -> str:
         """Normalize food and drink answers."""
         # Handle cultural food variations
-        for main_term, variations in self.cultural_variations.items():
-            if answer in variations and 'food' in self.cultural_variations:
-                return main_term
+        if 'food' in self.cultural_variations:
+            return self._cultural_lookup.get(answer, answer)
         return answer
 
 def create_answer_variants(answer: str) -> Set[str]:
@@ -204,7 +216,7 @@ def create_answer_variants(answer: str) -> Set[str]:
         variants.add(answer[4:])
         
     # Add variants without punctuation
-    no_punct = re.sub(r'[^\w\s]', '', answer)
+    no_punct = _RE_NONWORD.sub('', answer)
     variants.add(no_punct)
     
     # Add hyphenated/non-hyphenated variants
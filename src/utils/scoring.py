@@ -1,12 +1,20 @@
 """Score calculation and tracking utilities."""
+import heapq
 import logging
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 from dataclasses import dataclass, field
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+BASE_POINTS = 100
+DIFFICULTY_MULTIPLIERS = {
+    'easy': 0.75,
+    'normal': 1.0,
+    'hard': 1.5
+}
+
+@dataclass(slots=True)
 class PlayerScore:
     """Represents a player's score and stats for a game session."""
     total_score: int = 0
@@ -30,9 +38,10 @@ class ScoreTracker:
         Returns:
             PlayerScore: Player's score object
         """
-        if nick not in self.scores:
-            self.scores[nick] = PlayerScore()
-        return self.scores[nick]
+        player = self.scores.get(nick)
+        if player is None:
+            player = self.scores[nick] = PlayerScore()
+        return player
     
     def update_player_score(
         self,
@@ -62,8 +71,24 @@ class ScoreTracker:
         Args:
             nick: Player's nickname
         """
-        if nick in self.scores:
-            self.scores[nick].current_streak = 0
+        player = self.scores.get(nick)
+        if player is not None:
+            player.current_streak = 0
+            
+    def get_leaderboard(self, limit: int = 5) -> List[Tuple[str, PlayerScore]]:
+        """Get the top players by total score.
+        
+        Args:
+            limit: Maximum number of players to return
+            
+        Returns:
+            List[Tuple[str, PlayerScore]]: (nick, score) pairs, highest first
+        """
+        return heapq.nlargest(
+            limit,
+            self.scores.items(),
+            key=lambda item: item[1].total_score
+        )
             
     def clear_scores(self):
         """Clear all scores and stats."""
@@ -78,14 +103,8 @@ def calculate_base_points(difficulty: str = 'normal') -> int:
     Returns:
         int: Base points for the answer
     """
-    difficulty_multipliers = {
-        'easy': 0.75,
-        'normal': 1.0,
-        'hard': 1.5
-    }
-    base = 100
-    multiplier = difficulty_multipliers.get(difficulty.lower(), 1.0)
-    return int(base * multiplier)
+    multiplier = DIFFICULTY_MULTIPLIERS.get(difficulty.lower(), 1.0)
+    return int(BASE_POINTS * multiplier)
 
 def calculate_streak_multiplier(streak: int, max_multiplier: float = 2.0) -> float:
     """Calculate multiplier based on answer streak.
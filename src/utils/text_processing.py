@@ -1,12 +1,17 @@
 """Text processing utilities for the quiz bot."""
 import re
 import logging
+from functools import lru_cache
 from typing import Tuple, List
-from difflib import SequenceMatcher
 import unicodedata
+from rapidfuzz import fuzz
 
 logger = logging.getLogger(__name__)
 
+_RE_NONWORD = re.compile(r'[^\w\s]')
+_RE_MENTION = re.compile(r'@?(\w[-\w|]*)')
+_RE_CONTROL = re.compile(r'[\x00-\x1F\x7F]')
+
 def extract_command(message: str) -> Tuple[str, str]:
     """Extract command and arguments from a message.
     
@@ -16,11 +21,14 @@ def extract_command(message: str) -> Tuple[str, str]:
     Returns:
         Tuple[str, str]: Command and remaining arguments
     """
-    parts = message.strip().split(maxsplit=1)
-    command = parts[0].lower() if parts else ""
-    args = parts[1] if len(parts) > 1 else ""
-    return command, args
+    # Any run of whitespace (tabs included) separates command from args
+    parts = message.split(None, 1)
+    if not parts:
+        return "", ""
+    args = parts[1].rstrip() if len(parts) > 1 else ""
+    return parts[0].lower(), args
 
+@lru_cache(maxsize=2048)
 def normalize_text(text: str) -> str:
     """Normalize text for comparison.
     
@@ -33,11 +41,12 @@ def normalize_text(text: str) -> str:
     # Convert to lowercase and strip whitespace
     text = text.lower().strip()
     
-    # Remove accents and convert to ASCII
-    text = unicodedata.normalize('NFKD', text).encode('ASCII', 'ignore').decode()
+    # Remove accents and convert to ASCII (most answers already are)
+    if not text.isascii():
+        text = unicodedata.normalize('NFKD', text).encode('ASCII', 'ignore').decode()
     
     # Remove punctuation and extra whitespace
-    text = re.sub(r'[^\w\s]', '', text)
+    text = _RE_NONWORD.sub('', text)
     text = ' '.join(text.split())
     
     return text
@@ -57,10 +66,36 @@ def is_answer_match(
     Returns:
         bool: True if answer matches, False otherwise
     """
-    # Normalize both texts
-    given = normalize_text(given)
-    correct = normalize_text(correct)
+    # Identical input needs no normalization
+    if given == correct or given.strip().lower() == correct.strip().lower():
+        return True
+        
+    return match_normalized(
+        normalize_text(given),
+        normalize_text(correct),
+        similarity_threshold
+    )
+
+@lru_cache(maxsize=256)
+def match_normalized(
+    given: str,
+    correct: str,
+    similarity_threshold: float = 0.85
+) -> bool:
+    """Check if a normalized answer matches a normalized correct answer.
     
+    Lets callers normalize the correct answer once per question instead
+    of once per guess. Results are memoized, since players in a busy
+    channel often type the same guess in different casing.
+    
+    Args:
+        given: User's answer, already passed through normalize_text
+        correct: Correct answer, already passed through normalize_text
+        similarity_threshold: Minimum similarity ratio for fuzzy matching
+        
+    Returns:
+        bool: True if answer matches, False otherwise
+    """
     # Direct match
     if given == correct:
         return True
@@ -71,7 +106,11 @@ def is_answer_match(
         
     # For longer answers, use fuzzy matching
     if len(correct) > 5:
-        similarity = SequenceMatcher(None, given, correct).ratio()
+        # The ratio is at most 2*min/(len sum), so skip impossible matches
+        shortest = min(len(given), len(correct))
+        if 2 * shortest < similarity_threshold * (len(given) + len(correct)):
+            return False
+        similarity = fuzz.ratio(given, correct) / 100.0
         return similarity >= similarity_threshold
         
     return False
@@ -131,8 +170,7 @@ def extract_mentions(message: str) -> List[str]:
         List[str]: List of mentioned nicknames
     """
     # Match IRC nicknames (alphanumeric, -, _, and |)
-    pattern = r'@?(\w[-\w|]*)'
-    mentions = re.findall(pattern, message)
+    mentions = _RE_MENTION.findall(message)
     return [nick for nick in mentions if nick]
 
 def sanitize_input(text: str) -> str:
@@ -145,7 +183,7 @@ def sanitize_input(text: str) -> str:
         str: Sanitized text
     """
     # Remove IRC control characters
-    text = re.sub(r'[\x00-\x1F\x7F]', '', text)
+    text = _RE_CONTROL.sub('', text)
     
     # Remove potential IRC command characters
     text = text.replace('/', '').replace('\\', '')
@@ -8,6 +8,14 @@ from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+_RE_TRAILING_ARTIFACT = re.compile(r'\s*\(\?\s*$')
+_RE_VAGUE_TERMS = re.compile(r'\b(thing|stuff|something)\b')
+_RE_IMPERIAL_UNITS = re.compile(r'\b\d+\s*(?:foot|feet|inch|inches|mile|miles|pound|pounds|fahrenheit)\b')
+_RE_SLASH_DATE = re.compile(r'\b\d{1,2}/\d{1,2}/\d{2,4}\b')
+_RE_DASH_DATE = re.compile(r'\b\d{1,2}-\d{1,2}-\d{2,4}\b')
+_RE_ERA = re.compile(r'\b(CE|BCE|AD|BC)\b')
+_RE_SCORE = re.compile(r'\b\d+(?:\.\d+)?\s*-\s*\d+(?:\.\d+)?\b')
+
 class ValidationSeverity(Enum):
     ERROR = "error"
     WARNING = "warning"
@@ -26,6 +34,8 @@ class QuestionValidator:
             'how much', 'in what', 'on what', 'at what', 'why',
             'from what', 'for what', 'name the'
         }
+        # str.startswith takes a tuple and checks all starters in one call
+        self._starters = tuple(self.valid_starters)
         
         # Updated ambiguous words
         self.ambiguous_words = {
@@ -86,11 +96,17 @@ class QuestionValidator:
             (r'\b(thing|stuff|something)\b', "Question contains vague terminology")
         ]
         
+        # One alternation per substring term list, so a clean question is
+        # scanned once instead of once per term
+        self._multiple_answer_re = self._term_pattern(self.multiple_answer_indicators)
+        self._subjective_re = self._term_pattern(self.subjective_terms)
+        self._relative_time_re = self._term_pattern(self.relative_time_terms)
+        
         # Self-referential patterns
         self.self_referential_patterns = [
-            (r'\b(what|which) (\w+) (?:is|are) .*\2\b', "Question is self-referential"),
-            (r'\b(\w+) (?:used|found|contained) in .*\1\b', "Question reveals its own answer"),
-            (r'\bmakes up .*\b(\w+).*\1\b', "Question reveals its own answer")
+            (re.compile(r'\b(what|which) (\w+) (?:is|are) .*\2\b'), "Question is self-referential"),
+            (re.compile(r'\b(\w+) (?:used|found|contained) in .*\1\b'), "Question reveals its own answer"),
+            (re.compile(r'\bmakes up .*\b(\w+).*\1\b'), "Question reveals its own answer")
         ]
         
         # International sports coverage
@@ -120,8 +136,34 @@ class QuestionValidator:
         # Category usage tracking
         self.category_usage = {}
 
-    def validate_question(self, data: Dict, session_id: str = None) -> List[ValidationIssue]:
-        """Validate a question with enhanced checks."""
+    @staticmethod
+    def _term_pattern(terms: Set[str]) -> re.Pattern:
+        """Compile a regex matching any of the terms as a substring."""
+        return re.compile('|'.join(re.escape(term) for term in sorted(terms, key=len, reverse=True)))
+
+    @staticmethod
+    def _find_terms(pattern: re.Pattern, terms: Set[str], text: str) -> List[str]:
+        """Return every term contained in text, scanning once when none match."""
+        if not pattern.search(text):
+            return []
+        return [term for term in terms if term in text]
+
+    @staticmethod
+    def _has_error(issues: List[ValidationIssue]) -> bool:
+        """Check whether any issue is an error."""
+        return any(issue.severity == ValidationSeverity.ERROR for issue in issues)
+
+    def validate_question(
+        self,
+        data: Dict,
+        session_id: str = None,
+        fail_fast: bool = False
+    ) -> List[ValidationIssue]:
+        """Validate a question with enhanced checks.
+        
+        Checks run cheapest first. With fail_fast, validation stops after the
+        first stage that reports an error, so rejects skip the regex work.
+        """
         issues = []
         
         # Track category usage
@@ -166,67 +208,72 @@ class QuestionValidator:
             question += '?'
         
         # Remove trailing artifacts
-        question = re.sub(r'\s*\(\?\s*$', '?', question)
+        question = _RE_TRAILING_ARTIFACT.sub('?', question)
+        q_lower = question.lower()
         
         # Check question starter
-        if not any(question.lower().startswith(starter) for starter in self.valid_starters):
+        if not q_lower.startswith(self._starters):
             issues.append(ValidationIssue(
                 ValidationSeverity.ERROR,
                 "Question must start with valid question word"
             ))
 
-        # Check for ambiguous language
-        for word in self.ambiguous_words:
-            if f" {word} " in f" {question.lower()} ":
-                issues.append(ValidationIssue(
-                    ValidationSeverity.WARNING,
-                    f"Question contains ambiguous word: {word}"
-                ))
+        # Check for cut-off sentences in fun fact
+        if not fun_fact.rstrip().endswith(('.', '!', '?')):
+            issues.append(ValidationIssue(
+                ValidationSeverity.ERROR,
+                "Fun fact appears to be cut off"
+            ))
 
-        # Check for multiple answer indicators
-        for indicator in self.multiple_answer_indicators:
-            if indicator in question.lower():
-                issues.append(ValidationIssue(
-                    ValidationSeverity.ERROR,
-                    f"Question suggests multiple answers: {indicator}"
-                ))
+        if fail_fast and self._has_error(issues):
+            return issues
 
-        # Check for subjective terms
-        for term in self.subjective_terms:
-            if term in question.lower():
-                issues.append(ValidationIssue(
-                    ValidationSeverity.WARNING,
-                    f"Question contains subjective term: {term}"
-                ))
+        # Check for multiple answer indicators
+        for indicator in self._find_terms(self._multiple_answer_re, self.multiple_answer_indicators, q_lower):
+            issues.append(ValidationIssue(
+                ValidationSeverity.ERROR,
+                f"Question suggests multiple answers: {indicator}"
+            ))
 
         # Check for relative time terms
-        for term in self.relative_time_terms:
-            if term in question.lower():
-                issues.append(ValidationIssue(
-                    ValidationSeverity.ERROR,
-                    f"Question contains relative time term: {term}"
-                ))
+        for term in self._find_terms(self._relative_time_re, self.relative_time_terms, q_lower):
+            issues.append(ValidationIssue(
+                ValidationSeverity.ERROR,
+                f"Question contains relative time term: {term}"
+            ))
 
         # Check for self-referential patterns
         for pattern, message in self.self_referential_patterns:
-            if re.search(pattern, question.lower()):
+            if pattern.search(q_lower):
                 issues.append(ValidationIssue(
                     ValidationSeverity.ERROR,
                     message
                 ))
 
-        # Fun fact validation
-        if question.lower() in fun_fact.lower() or answer.lower() in fun_fact.lower():
+        if fail_fast and self._has_error(issues):
+            return issues
+
+        # Check for ambiguous language (whole words only)
+        q_words = set(q_lower.split())
+        for word in self.ambiguous_words & q_words:
             issues.append(ValidationIssue(
                 ValidationSeverity.WARNING,
-                "Fun fact should not repeat question or answer verbatim"
+                f"Question contains ambiguous word: {word}"
             ))
 
-        # Check for cut-off sentences in fun fact
-        if not fun_fact.rstrip().endswith(('.', '!', '?')):
+        # Check for subjective terms
+        for term in self._find_terms(self._subjective_re, self.subjective_terms, q_lower):
             issues.append(ValidationIssue(
-                ValidationSeverity.ERROR,
-                "Fun fact appears to be cut off"
+                ValidationSeverity.WARNING,
+                f"Question contains subjective term: {term}"
+            ))
+
+        # Fun fact validation
+        fun_fact_lower = fun_fact.lower()
+        if q_lower in fun_fact_lower or answer.lower() in fun_fact_lower:
+            issues.append(ValidationIssue(
+                ValidationSeverity.WARNING,
+                "Fun fact should not repeat question or answer verbatim"
             ))
 
         # Category-specific validation
@@ -243,14 +290,14 @@ class QuestionValidator:
 
         if category == 'science':
             # Validate scientific answers
-            if re.search(r'\b(thing|stuff|something)\b', question):
+            if _RE_VAGUE_TERMS.search(question):
                 issues.append(ValidationIssue(
                     ValidationSeverity.ERROR,
                     "Science questions should use precise terminology"
                 ))
             
             # Enforce metric units
-            if re.search(r'\b\d+\s*(?:foot|feet|inch|inches|mile|miles|pound|pounds|fahrenheit)\b', question):
+            if _RE_IMPERIAL_UNITS.search(question):
                 issues.append(ValidationIssue(
                     ValidationSeverity.WARNING,
                     "Use metric units for science questions"
@@ -258,15 +305,14 @@ class QuestionValidator:
 
         elif category == 'history':
             # Standardize date formats
-            if re.search(r'\b\d{1,2}/\d{1,2}/\d{2,4}\b', question) or \
-               re.search(r'\b\d{1,2}-\d{1,2}-\d{2,4}\b', question):
+            if _RE_SLASH_DATE.search(question) or _RE_DASH_DATE.search(question):
                 issues.append(ValidationIssue(
                     ValidationSeverity.ERROR,
                     "Use year only for historical dates unless month is crucial"
                 ))
 
             # Remove era designations from answers
-            if re.search(r'\b(CE|BCE|AD|BC)\b', answer):
+            if _RE_ERA.search(answer):
                 issues.append(ValidationIssue(
                     ValidationSeverity.ERROR,
                     "Remove era designations (CE/BCE/AD/BC) from year answers"
@@ -302,7 +348,7 @@ class QuestionValidator:
                 ))
 
             # Validate score/record formats
-            if re.search(r'\b\d+(?:\.\d+)?\s*-\s*\d+(?:\.\d+)?\b', answer):
+            if _RE_SCORE.search(answer):
                 issues.append(ValidationIssue(
                     ValidationSeverity.WARNING,
                     "Consider using ranges for sports records/scores"
@@ -311,7 +357,7 @@ class QuestionValidator:
         elif category == 'entertainment':
             # Check for regional bias
             western_terms = ['hollywood', 'oscar', 'emmy', 'grammy']
-            if any(term in question.lower() for term in western_terms):
+            if any(term in question for term in western_terms):
                 issues.append(ValidationIssue(
                     ValidationSeverity.WARNING,
                     "Consider including non-Western entertainment"
@@ -321,7 +367,7 @@ class QuestionValidator:
             # Validate cultural representation
             region_mentioned = False
             for region in self.cultural_categories[category]:
-                if region in question.lower():
+                if region in question:
                     region_mentioned = True
                     break
             
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Modules import each other flat from src/, as when the bot runs
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "src"))
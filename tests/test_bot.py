@@ -0,0 +1,36 @@
+import asyncio
+import sys
+import types
+
+import pytest
+
+pytest.importorskip("irc")
+
+
+@pytest.fixture
+def bot_module(monkeypatch):
+    # bot.py still imports the old top-level database module
+    legacy_db = types.ModuleType("database")
+    legacy_db.Database = object
+    monkeypatch.setitem(sys.modules, "database", legacy_db)
+    monkeypatch.delitem(sys.modules, "bot", raising=False)
+    import bot
+    return bot
+
+
+def _event(text):
+    return types.SimpleNamespace(arguments=[text])
+
+
+@pytest.mark.parametrize("text", ["!quiz\tnow", "!QUIZ", "!quiz  extra"])
+def test_command_dispatch_splits_on_any_whitespace(bot_module, text):
+    quiz_bot = object.__new__(bot_module.QuizBot)
+    seen = []
+
+    async def cmd_quiz(event):
+        seen.append(event.arguments[0])
+
+    quiz_bot.cmd_quiz = cmd_quiz
+    asyncio.run(quiz_bot._on_pubmsg(None, _event(text)))
+
+    assert seen == [text]
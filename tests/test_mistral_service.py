@@ -0,0 +1,45 @@
+from services.mistral_service import MistralService
+
+
+def _service():
+    return MistralService(api_key="test", database=None)
+
+
+def _group(service, *names):
+    return [c for c in service.categories if c["name"] in names]
+
+
+def test_fenced_array_falls_back_to_flat_parser():
+    service = _service()
+    group = _group(service, "geography", "history")
+    content = (
+        "Here are your questions:\n"
+        "```json\n"
+        "[\n"
+        '  {"question": "What is the capital of France?", "answer": "paris",'
+        ' "fun_fact": "Paris was once called Lutetia.", "category": "Geography"},\n'
+        '  {"question": "In what year did the Berlin Wall fall?", "answer": "1989",'
+        ' "fun_fact": "The wall stood for 28 years.", "category": "history"}\n'
+        "]\n"
+        "```"
+    )
+
+    parsed = service._parse_group_response(content, group)
+
+    assert [q["answer"] for q in parsed["geography"]] == ["paris"]
+    assert [q["answer"] for q in parsed["history"]] == ["1989"]
+
+
+def test_grouped_object_matches_category_names_case_insensitively():
+    service = _service()
+    group = _group(service, "geography", "history")
+    content = (
+        '{"Geography": [{"question": "What is the capital of Peru?", "answer": "lima",'
+        ' "fun_fact": "Lima was founded in 1535."}],'
+        ' "history": []}'
+    )
+
+    parsed = service._parse_group_response(content, group)
+
+    assert [q["answer"] for q in parsed["geography"]] == ["lima"]
+    assert parsed["history"] == []